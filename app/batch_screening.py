@@ -0,0 +1,237 @@
+"""
+Headless batch screening: ranks a directory of resumes against one or more job descriptions
+without Streamlit.
+
+    python -m app.batch_screening --resumes resumes/ --jd jds/ --output results.jsonl --workers 8
+
+Each worker process loads the spaCy and embedding models once, parses the JDs once, then
+screens chunks of resumes against every JD. Results stream to JSONL as chunks finish and are
+written to the database in batched transactions (one session per JD). Throughput and
+per-stage timings are printed to stderr at the end.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app import file_utils
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+STAGES = ["extract", "parse", "score"]
+DB_WRITE_ATTEMPTS = 3
+
+_worker_state: Dict[str, Any] = {}
+
+def find_documents(path: str) -> List[str]:
+    if os.path.isfile(path):
+        return [path]
+    found = []
+    for root, _, files in os.walk(path):
+        found.extend(os.path.join(root, f) for f in files if f.lower().endswith(SUPPORTED_EXTENSIONS))
+    return sorted(found)
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _init_worker(jd_texts: Dict[str, str]):
+    try:
+        # One worker per core already; keep torch from oversubscribing each core
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    from app import models, resume_parser
+    nlp, embedder = models.load_models()
+    _worker_state["nlp"] = nlp
+    _worker_state["embedder"] = embedder
+    _worker_state["jds"] = {title: resume_parser.parse_job_description(text, nlp) for title, text in jd_texts.items()}
+
+def _screen_chunk(paths: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]], Dict[str, float]]:
+    """Extracts, parses and scores one chunk; returns (records, failures, stage seconds)."""
+    from app import matcher, resume_parser
+    nlp, embedder, jds = _worker_state["nlp"], _worker_state["embedder"], _worker_state["jds"]
+    timings = defaultdict(float)
+
+    start = time.perf_counter()
+    texts = [file_utils.extract_text_from_file(p) for p in paths]
+    timings["extract"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed_list = resume_parser.parse_resumes(texts, nlp)
+    timings["parse"] += time.perf_counter() - start
+
+    records, failures = [], []
+    start = time.perf_counter()
+    for path, parsed in zip(paths, parsed_list):
+        if not parsed:
+            failures.append({"path": path, "error": "no text extracted"})
+            continue
+        parsed["filename"] = os.path.basename(path)
+        for title, jd in jds.items():
+            breakdown = matcher.calculate_score_breakdown(parsed, jd, embedder)
+            records.append({
+                "job_title": title,
+                "path": path,
+                "filename": parsed["filename"],
+                "score": breakdown.pop("final"),
+                "score_breakdown": breakdown,
+                "parsed_data": parsed,
+            })
+    timings["score"] += time.perf_counter() - start
+    return records, failures, dict(timings)
+
+def _jsonl_record(record: Dict[str, Any]) -> str:
+    data = record["parsed_data"]
+    return json.dumps({
+        "job_title": record["job_title"],
+        "filename": record["filename"],
+        "path": record["path"],
+        "score": record["score"],
+        "score_breakdown": record["score_breakdown"],
+        "name": data.get("contact_info", {}).get("name", ""),
+        "email": data.get("contact_info", {}).get("email", ""),
+        "total_experience_years": data.get("total_experience_years", 0.0),
+        "skills": data.get("skills", []),
+    }) + "\n"
+
+def run_batch(resume_paths: List[str], jd_texts: Dict[str, str], out, workers: int = 0,
+              chunk_size: int = 32, db_batch: int = 5000, save_to_db: bool = True) -> Dict[str, Any]:
+    from app import storage
+    workers = workers or os.cpu_count() or 1
+    session_ids = {}
+    if save_to_db:
+        storage.init_db()
+        session_ids = {title: storage.create_session(title) for title in jd_texts}
+        missing = [title for title, sid in session_ids.items() if sid is None]
+        if missing:
+            raise RuntimeError(f"Could not create database sessions for: {', '.join(missing)}")
+
+    totals = {"resumes": 0, "failed": 0, "scores": 0, "db_batches": 0}
+    timings = defaultdict(float)
+    pending: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    pending_rows = 0
+
+    def flush():
+        nonlocal pending_rows
+        if not pending_rows:
+            return
+        start = time.perf_counter()
+        # append_results rolls back on failure, so a retry can't duplicate rows
+        for attempt in range(1, DB_WRITE_ATTEMPTS + 1):
+            if storage.append_results(dict(pending)):
+                break
+            if attempt == DB_WRITE_ATTEMPTS:
+                raise RuntimeError(f"Saving {pending_rows} results to the database failed {attempt} times")
+            time.sleep(2 ** (attempt - 1))
+        timings["db_write"] += time.perf_counter() - start
+        totals["db_batches"] += 1
+        pending.clear()
+        pending_rows = 0
+
+    start = time.perf_counter()
+    chunks = list(_chunks(resume_paths, chunk_size))
+    if workers == 1:
+        _init_worker(jd_texts)
+        results = map(_screen_chunk, chunks)
+        pool = None
+    else:
+        pool = mp.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(jd_texts,))
+        results = pool.imap_unordered(_screen_chunk, chunks)
+    try:
+        for records, failures, chunk_timings in results:
+            for stage, seconds in chunk_timings.items():
+                timings[stage] += seconds
+            totals["resumes"] += len({r["path"] for r in records}) + len(failures)
+            totals["failed"] += len(failures)
+            totals["scores"] += len(records)
+            for failure in failures:
+                out.write(json.dumps(failure) + "\n")
+            for record in records:
+                out.write(_jsonl_record(record))
+                if save_to_db:
+                    # The archive stores each resume's text once (by content hash) and links it to every JD's session
+                    entry = {k: record[k] for k in ("filename", "score", "score_breakdown", "parsed_data")}
+                    pending[session_ids[record["job_title"]]].append(entry)
+                    pending_rows += 1
+            if pending_rows >= db_batch:
+                flush()
+        flush()
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+        raise
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    out.flush()
+    totals["elapsed"] = time.perf_counter() - start
+    totals["workers"] = workers
+    totals["timings"] = dict(timings)
+    totals["session_ids"] = session_ids
+    return totals
+
+def print_summary(summary: Dict[str, Any], stream=sys.stderr):
+    elapsed = summary["elapsed"] or 1e-9
+    resumes = summary["resumes"] or 1
+    print(f"Screened {summary['resumes']} resumes ({summary['failed']} failed), "
+          f"{summary['scores']} scores with {summary['workers']} workers in {elapsed:.1f}s", file=stream)
+    print(f"Throughput: {summary['resumes'] / elapsed:.1f} resumes/s, {summary['scores'] / elapsed:.1f} scores/s",
+          file=stream)
+    print("Stage timings (worker time summed across processes):", file=stream)
+    for stage in STAGES + ["db_write"]:
+        seconds = summary["timings"].get(stage, 0.0)
+        print(f"  {stage:<9} {seconds:9.2f}s  {seconds * 1000 / resumes:8.2f} ms/resume", file=stream)
+    if summary["session_ids"]:
+        sessions = ", ".join(f"{title}={sid}" for title, sid in summary["session_ids"].items())
+        print(f"Saved sessions: {sessions} ({summary['db_batches']} batched writes)", file=stream)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of resumes against job descriptions.")
+    parser.add_argument("--resumes", required=True, help="Resume file or directory (searched recursively)")
+    parser.add_argument("--jd", required=True, action="append",
+                        help="Job description file or directory; repeatable")
+    parser.add_argument("--output", default="-", help="JSONL output path ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Resumes per worker task")
+    parser.add_argument("--db-batch", type=int, default=5000, help="Result rows per database transaction")
+    parser.add_argument("--no-db", action="store_true", help="Don't save results to the database")
+    args = parser.parse_args(argv)
+
+    jd_paths = [p for path in args.jd for p in find_documents(path)]
+    jd_texts = {}
+    for path in jd_paths:
+        text = file_utils.extract_text_from_file(path)
+        if text.strip():
+            title = os.path.splitext(os.path.basename(path))[0]
+            if title in jd_texts:
+                # Same basename in another directory: keep both, told apart by path
+                title = f"{title} ({path})"
+            jd_texts[title] = text
+        else:
+            print(f"Could not extract text from JD: {path}", file=sys.stderr)
+    resume_paths = find_documents(args.resumes)
+    if not jd_texts or not resume_paths:
+        print("Nothing to screen: need at least one readable JD and one resume.", file=sys.stderr)
+        return 1
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = run_batch(resume_paths, jd_texts, out, workers=args.workers, chunk_size=args.chunk_size,
+                            db_batch=args.db_batch, save_to_db=not args.no_db)
+    except RuntimeError as e:
+        print(f"[BATCH ERROR] {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print_summary(summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Session-scoped, content-addressed blob store on local disk.
+
+Upload bytes and resume full texts are written here so session state only holds their
+handles (sha1 hex digests). Each session gets its own directory; directories not used for
+BLOB_STORE_TTL_HOURS (default 6) are removed by collect_garbage(), which runs automatically
+at most every GC_INTERVAL seconds when a store is opened. A session idle for longer than that
+can find its blobs gone, so callers check exists() before relying on a handle. The root and
+session directories are private to the user (mode 0700), since the blobs are resume PII.
+"""
+import getpass
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+from app.file_utils import ensure_private_dir
+
+BLOB_ROOT = os.getenv("BLOB_STORE_DIR", os.path.join(tempfile.gettempdir(), f"resume_screening_blobs-{getpass.getuser()}"))
+DEFAULT_TTL = float(os.getenv("BLOB_STORE_TTL_HOURS", "6")) * 3600
+GC_INTERVAL = 600
+TOUCH_INTERVAL = 60
+_MARKER = ".last_used"
+
+_gc_lock = threading.Lock()
+_last_gc = 0.0
+
+class BlobStore:
+    def __init__(self, session_id: str, root: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.root = root or BLOB_ROOT
+        self.dir = os.path.join(self.root, session_id)
+        self.ttl = ttl
+        self._last_touch = 0.0
+        ensure_private_dir(self.root)
+        self.touch(force=True)
+        maybe_collect_garbage(self.root, ttl)
+
+    def touch(self, force: bool = False):
+        """Marks the session as in use; throttled so hot paths don't stat the marker every call."""
+        now = time.time()
+        if force or now - self._last_touch > TOUCH_INTERVAL:
+            ensure_private_dir(self.dir)   # recreate if GC removed it after a long idle
+            with open(os.path.join(self.dir, _MARKER), "a"):
+                os.utime(os.path.join(self.dir, _MARKER))
+            self._last_touch = now
+
+    def path(self, handle: str) -> str:
+        return os.path.join(self.dir, handle)
+
+    def exists(self, handle: str) -> bool:
+        return os.path.exists(self.path(handle))
+
+    def put(self, data: Union[bytes, bytearray, memoryview], handle: Optional[str] = None) -> str:
+        """Stores data (once per content) and returns its handle."""
+        handle = handle or hashlib.sha1(data).hexdigest()
+        self.touch()
+        path = self.path(handle)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        return handle
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get(self, handle: str) -> bytes:
+        self.touch()
+        with open(self.path(handle), "rb") as fh:
+            return fh.read()
+
+    def get_text(self, handle: str) -> str:
+        return self.get(handle).decode("utf-8")
+
+    @contextmanager
+    def view(self, handle: str) -> Iterator[memoryview]:
+        """Read-only memory-mapped view of a blob, for large uploads that shouldn't be copied into RAM."""
+        self.touch()
+        with open(self.path(handle), "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffer = memoryview(mapped)
+                try:
+                    yield buffer
+                finally:
+                    buffer.release()
+
+    def delete(self, handle: str):
+        try:
+            os.remove(self.path(handle))
+        except FileNotFoundError:
+            pass
+
+    def size_bytes(self) -> int:
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.dir) if entry.name != _MARKER)
+        except FileNotFoundError:
+            return 0
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+def collect_garbage(root: Optional[str] = None, ttl: float = DEFAULT_TTL) -> int:
+    """Removes session directories unused for ttl seconds; returns how many were removed."""
+    root = root or BLOB_ROOT
+    removed = 0
+    cutoff = time.time() - ttl
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        marker = os.path.join(entry.path, _MARKER)
+        try:
+            last_used = os.path.getmtime(marker) if os.path.exists(marker) else entry.stat().st_mtime
+        except OSError:
+            continue
+        if last_used < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+def maybe_collect_garbage(root: Optional[str] = None, ttl: float = DEFAULT_TTL):
+    global _last_gc
+    with _gc_lock:
+        if time.time() - _last_gc < GC_INTERVAL:
+            return
+        _last_gc = time.time()
+    try:
+        collect_garbage(root, ttl)
+    except OSError as e:
+        print(f"[BLOB ERROR] Garbage collection failed: {e}")
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app import storage
+
+EXPORT_COLUMNS = ["session_id", "job_title", "timestamp", "filename", "score"] + storage.SCORE_COLUMNS
+EXPORT_FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+def iter_csv(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    """Renders result chunks as CSV text, one string per chunk (header first)."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+def iter_jsonl(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(json.dumps({c: row.get(c) for c in EXPORT_COLUMNS}) + "\n" for row in chunk)
+
+def _write_text(chunks, output_path: str, render):
+    with open(output_path, "w", encoding="utf-8", newline="") as fh:
+        for text in render(chunks):
+            fh.write(text)
+
+def _write_arrow(chunks, output_path: str, fmt: str):
+    # pyarrow is optional; only the columnar formats need it
+    import pyarrow as pa
+    schema = pa.schema([
+        ("session_id", pa.int64()), ("job_title", pa.string()), ("timestamp", pa.string()),
+        ("filename", pa.string()), ("score", pa.float64()),
+    ] + [(c, pa.float64()) for c in storage.SCORE_COLUMNS])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(output_path, schema)
+    else:
+        writer = pa.ipc.new_file(output_path, schema)
+    try:
+        # One row group / record batch per chunk keeps memory at chunk size
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+    finally:
+        writer.close()
+
+def export_results(
+    output_path: str = "",
+    fmt: str = "csv",
+    session_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    job_title: Optional[str] = None,
+    chunk_size: int = 5000
+) -> str:
+    """
+    Streams stored results matching the filters into a CSV, JSONL, Parquet or Arrow file,
+    one storage.iter_results chunk at a time. Returns the written path, or "" on failure.
+    """
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        print(f"[ERROR] Unsupported export format: {fmt}")
+        return ""
+    if not output_path:
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=EXPORT_FORMATS[fmt])
+        output_path = tmp.name
+        tmp.close()
+    chunks = storage.iter_results(session_id=session_id, start_date=start_date, end_date=end_date,
+                                  job_title=job_title, chunk_size=chunk_size)
+    try:
+        if fmt == "csv":
+            _write_text(chunks, output_path, iter_csv)
+        elif fmt == "jsonl":
+            _write_text(chunks, output_path, iter_jsonl)
+        else:
+            _write_arrow(chunks, output_path, fmt)
+        return output_path
+    except ImportError:
+        print(f"[ERROR] {fmt} export requires pyarrow (pip install pyarrow).", file=sys.stderr)
+    except Exception as e:
+        print(f"[EXPORT ERROR] Exception during {fmt} export: {e}", file=sys.stderr)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    return ""
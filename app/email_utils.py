@@ -1,37 +1,329 @@
 import yagmail
 import os
+import heapq
+import itertools
+import logging
+import queue
+import shutil
+import smtplib
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app import metrics
 
 load_dotenv()
 
-def send_email_report(to_email: str, subject: str, body: str, attachment_path: Optional[str] = None) -> bool:
-    sender_email = os.getenv("EMAIL_SENDER")
-    app_password = os.getenv("EMAIL_APP_PASSWORD")
-    print(f"[DEBUG] EMAIL_SENDER: {sender_email!r}")
-    print(f"[DEBUG] EMAIL_APP_PASSWORD is set: {bool(app_password)}")
-    print(f"[DEBUG] Recipient: {to_email}, Subject: {subject}")
-    print(f"[DEBUG] Attachment path: {attachment_path}")
-    if not sender_email or not app_password:
-        print("[ERROR] Missing EMAIL_SENDER or EMAIL_APP_PASSWORD in environment.")
-        return False
-    try:
-        yag = yagmail.SMTP(sender_email, app_password)
-        print("[DEBUG] Yagmail client initialized successfully.")
-        yag.send(
-            to=to_email,
-            subject=subject,
-            contents=body,
-            attachments=[attachment_path] if attachment_path else None
-        )
-        print(f"[SUCCESS] Email report sent to {to_email}")
+logger = logging.getLogger(__name__)
+
+def _smtp_settings() -> Dict[str, Any]:
+    """SMTP settings from the environment; EMAIL_SMTP_HOST/PORT point the sender at another server (e.g. a local stand-in)."""
+    settings = {
+        "user": os.getenv("EMAIL_SENDER"),
+        "password": os.getenv("EMAIL_APP_PASSWORD"),
+        "host": os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com"),
+    }
+    if os.getenv("EMAIL_SMTP_PORT"):
+        settings["port"] = int(os.getenv("EMAIL_SMTP_PORT"))
+    if os.getenv("EMAIL_SMTP_PLAIN", "").lower() in ("1", "true", "yes"):
+        # Unencrypted, unauthenticated SMTP for local test servers only
+        settings.update(smtp_ssl=False, smtp_starttls=False, smtp_skip_login=True, password=None)
+    return settings
+
+def _is_transient(error: Exception) -> bool:
+    """Worth retrying: dropped connections, socket errors/timeouts and 4xx "try again later" replies."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
         return True
-    except yagmail.YagAuthError as e:
-        print(f"[ERROR] Email authentication failed. Details: {e}")
-        return False
-    except yagmail.YagConnectionError as e:
-        print(f"[ERROR] Could not connect to email server: {e}")
+    if isinstance(error, smtplib.SMTPException):
+        # Refused recipients, bad data etc. won't succeed on retry (SMTPException is an OSError subclass)
         return False
-    except Exception as e:
-        print(f"[ERROR] Unexpected error sending email: {e}")
+    # Network trouble only; other OSErrors (a missing or unreadable attachment) fail the same way every time
+    return isinstance(error, (ConnectionError, TimeoutError, socket.timeout, socket.gaierror, socket.herror))
+
+class SMTPConnection:
+    """
+    One logged-in SMTP session reused for many messages. yagmail.SMTP.send() reconnects
+    and logs in on every call, so messages are built with prepare_send() and handed to
+    the open smtplib connection directly.
+    """
+    def __init__(self, **settings):
+        self.settings = settings
+        self.client = None
+        self.opened_at = 0.0
+
+    def open(self):
+        self.client = yagmail.SMTP(**self.settings)
+        self.client.login()
+        self.opened_at = time.monotonic()
+
+    def is_open(self) -> bool:
+        if self.client is None or self.client.is_closed:
+            return False
+        try:
+            return self.client.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, to, subject: str, body: str, attachments: Optional[List[str]] = None):
+        recipients, message = self.client.prepare_send(to=to, subject=subject, contents=body, attachments=attachments)
+        refused = self.client.smtp.sendmail(self.client.user, recipients, message)
+        if refused and len(refused) == len(recipients):
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+
+class EmailJob:
+    def __init__(self, job_id: int, to: Union[str, List[str]], subject: str, body: str,
+                 attachments: Optional[List[str]] = None):
+        self.job_id = job_id
+        self.to = to
+        self.subject = subject
+        self.body = body
+        self.status = "queued"
+        self.attempts = 0
+        self.error = ""
+        self.future = Future()
+        self.spool_dir = ""
+        self.attachments = self._spool(attachments or [])
+
+    def _spool(self, attachments: List[str]) -> List[str]:
+        """
+        Copies attachments into a private directory owned by the job, so files the caller may
+        evict or overwrite (e.g. the shared report cache) survive until delivery. Keeps basenames,
+        which become the attachment names.
+        """
+        if not attachments:
+            return []
+        self.spool_dir = tempfile.mkdtemp(prefix=f"resume_email_{self.job_id}_")
+        copies = []
+        try:
+            for i, path in enumerate(attachments):
+                target_dir = os.path.join(self.spool_dir, str(i))
+                os.mkdir(target_dir)
+                copies.append(shutil.copy(path, os.path.join(target_dir, os.path.basename(path))))
+        except OSError:
+            self.release()
+            raise
+        return copies
+
+    def release(self):
+        if self.spool_dir:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+            self.spool_dir = ""
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"job_id": self.job_id, "to": self.to, "subject": self.subject, "status": self.status,
+                "attempts": self.attempts, "error": self.error}
+
+class EmailDeliveryQueue:
+    """
+    Background mail sender. Jobs are sent in batches over one reused SMTP connection,
+    which is kept open for idle_timeout seconds between batches. Transient failures are
+    retried with exponential backoff (base_delay * 2**attempt) up to max_attempts.
+    Each job's future resolves to True once sent, or False when it finally fails.
+    """
+    def __init__(self, connection_factory: Optional[Callable[[], SMTPConnection]] = None,
+                 batch_size: int = 50, max_attempts: int = 4, base_delay: float = 2.0,
+                 idle_timeout: float = 30.0, max_jobs_tracked: int = 1000):
+        self.connection_factory = connection_factory or (lambda: SMTPConnection(**_smtp_settings()))
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.idle_timeout = idle_timeout
+        self.max_jobs_tracked = max_jobs_tracked
+        self._queue = queue.Queue()
+        self._retries = []  # heap of (due_time, seq, job)
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, EmailJob] = {}
+        self._lock = threading.Lock()
+        self._stats = {"sent": 0, "failed": 0, "retries": 0, "connections_opened": 0, "batches": 0}
+        self._connection = None
+        self._last_used = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="email-delivery", daemon=True)
+        self._thread.start()
+
+    def submit(self, to: Union[str, List[str]], subject: str, body: str,
+               attachments: Optional[List[str]] = None) -> EmailJob:
+        if self._closed:
+            raise RuntimeError("Email delivery queue is closed.")
+        job = EmailJob(next(self._ids), to, subject, body, attachments)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            # Forget the oldest finished jobs so status tracking stays bounded
+            if len(self._jobs) > self.max_jobs_tracked:
+                for old_id in [i for i, j in self._jobs.items() if j.future.done()][:len(self._jobs) - self.max_jobs_tracked]:
+                    del self._jobs[old_id]
+        self._queue.put(job)
+        return job
+
+    def status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.as_dict() if job else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = dict(self._stats)
+            result["pending_retries"] = len(self._retries)
+        result["queue_depth"] = self._queue.qsize()
+        return result
+
+    def close(self, timeout: Optional[float] = None):
+        """Stops accepting jobs, sends what is queued (retries still pending are failed) and disconnects."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            if batch:
+                self._send_batch(batch)
+            elif self._connection is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._disconnect()
+        with self._lock:
+            leftovers = [job for _, _, job in self._retries]
+            self._retries = []
+        for job in leftovers:
+            self._finish(job, False)
+        self._disconnect()
+
+    def _next_batch(self) -> Optional[List[EmailJob]]:
+        """Collects due retries plus queued jobs; returns None once close() was requested."""
+        batch = []
+        with self._lock:
+            now = time.monotonic()
+            while self._retries and self._retries[0][0] <= now and len(batch) < self.batch_size:
+                batch.append(heapq.heappop(self._retries)[2])
+            next_due = self._retries[0][0] - now if self._retries else None
+        wait = 0 if batch else min(next_due if next_due is not None else 1.0, 1.0)
+        try:
+            job = self._queue.get(timeout=wait) if wait else self._queue.get_nowait()
+        except queue.Empty:
+            return batch
+        if job is None:
+            if not batch:
+                return None
+            # Send the due retries first; the stop marker is seen again next round
+            self._queue.put(None)
+            return batch
+        batch.append(job)
+        return batch + self._drain(self.batch_size - len(batch))
+
+    def _drain(self, limit: Optional[int] = None) -> List[EmailJob]:
+        jobs = []
+        while limit is None or len(jobs) < limit:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                self._queue.put(None)
+                break
+            jobs.append(job)
+        return jobs
+
+    def _send_batch(self, batch: List[EmailJob]):
+        with self._lock:
+            self._stats["batches"] += 1
+        for job in batch:
+            job.attempts += 1
+            job.status = "sending"
+            try:
+                self._connect()
+                self._connection.send(job.to, job.subject, job.body, job.attachments)
+                self._last_used = time.monotonic()
+                logger.info("Email report %s sent to %s", job.job_id, job.to)
+                self._finish(job, True)
+            except Exception as e:
+                job.error = str(e)
+                if _is_transient(e) and not isinstance(e, smtplib.SMTPResponseException):
+                    # The connection itself broke; a 4xx reply leaves it usable
+                    self._disconnect()
+                if _is_transient(e) and job.attempts < self.max_attempts and not self._closed:
+                    delay = self.base_delay * 2 ** (job.attempts - 1)
+                    logger.warning("Email report %s failed (attempt %s), retrying in %.1fs: %s",
+                                   job.job_id, job.attempts, delay, e)
+                    job.status = "retrying"
+                    with self._lock:
+                        self._stats["retries"] += 1
+                        heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), job))
+                else:
+                    logger.error("Email report %s to %s failed: %s", job.job_id, job.to, e)
+                    self._finish(job, False)
+
+    def _connect(self):
+        # Only probe with NOOP after a pause; back-to-back sends trust the open connection
+        if self._connection is not None and (time.monotonic() - self._last_used < 5 or self._connection.is_open()):
+            return
+        self._disconnect()
+        connection = self.connection_factory()
+        connection.open()
+        self._connection = connection
+        with self._lock:
+            self._stats["connections_opened"] += 1
+
+    def _disconnect(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _finish(self, job: EmailJob, sent: bool):
+        job.release()
+        job.status = "sent" if sent else "failed"
+        metrics.inc("emails_total", status=job.status)
+        with self._lock:
+            self._stats["sent" if sent else "failed"] += 1
+        job.future.set_result(sent)
+
+_delivery_queue: Optional[EmailDeliveryQueue] = None
+_delivery_lock = threading.Lock()
+
+def get_delivery_queue() -> EmailDeliveryQueue:
+    """Process-wide delivery queue, started on first use."""
+    global _delivery_queue
+    with _delivery_lock:
+        if _delivery_queue is None:
+            _delivery_queue = EmailDeliveryQueue()
+        return _delivery_queue
+
+def _credentials_configured() -> bool:
+    settings = _smtp_settings()
+    return bool(settings["user"] and (settings["password"] or settings.get("smtp_skip_login")))
+
+def enqueue_email_report(to_email: Union[str, List[str]], subject: str, body: str,
+                         attachment_path: Optional[str] = None) -> Optional[EmailJob]:
+    """Queues a report for background delivery; poll get_delivery_queue().status(job.job_id) or wait on job.future."""
+    if not _credentials_configured():
+        logger.error("Missing EMAIL_SENDER or EMAIL_APP_PASSWORD in environment.")
+        return None
+    try:
+        return get_delivery_queue().submit(to_email, subject, body, [attachment_path] if attachment_path else None)
+    except OSError as e:
+        logger.error("Could not queue email report, attachment unreadable: %s", e)
+        return None
+
+def send_email_report(to_email: str, subject: str, body: str, attachment_path: Optional[str] = None) -> bool:
+    """Sends through the shared delivery queue and waits for the outcome (retries included)."""
+    job = enqueue_email_report(to_email, subject, body, attachment_path)
+    if job is None:
         return False
+    return job.future.result()
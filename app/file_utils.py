@@ -1,6 +1,9 @@
 import fitz
 import docx2txt
 import os
+import stat
+
+from app import metrics
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     try:
@@ -22,10 +25,26 @@ def extract_text_from_txt(txt_path: str) -> str:
     except Exception:
         return ""
 
+def ensure_private_dir(path: str) -> str:
+    """
+    Creates path with mode 0700 for files holding resume data (tightening an existing one), and
+    refuses a directory owned by another user, e.g. one planted under the shared temp dir.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.name == "posix":
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise RuntimeError(f"{path} is not a directory owned by the current user")
+        if info.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    return path
+
+@metrics.timed("extract")
 def extract_text_from_file(file_path: str) -> str:
     if not os.path.exists(file_path):
         return ""
     ext = os.path.splitext(file_path)[1].lower()
+    metrics.inc("documents_total", kind="extracted")
     if ext == ".pdf":
         return extract_text_from_pdf(file_path)
     if ext in [".docx", ".doc"]:
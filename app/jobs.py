@@ -0,0 +1,516 @@
+"""
+Durable screening jobs backed by the SQLite database.
+
+    python -m app.jobs submit --resumes resumes/ --jd jd.txt --title "Backend Engineer"
+    python -m app.jobs worker            # run on as many processes / hosts as you like
+    python -m app.jobs status [JOB_ID]
+    python -m app.jobs cancel JOB_ID
+
+A job is split into chunk tasks (extract -> parse -> score a slice of the resume files) plus
+one finalize task that ranks every chunk's results and saves them as a screening session.
+Workers claim tasks under a lease that a heartbeat thread keeps extending. A worker that dies
+stops heartbeating, its lease expires, and another worker picks the task up again. Each
+finished chunk is checkpointed in the database, so a restarted run only redoes unfinished
+chunks.
+
+Workers on several hosts can share one database file (RESUME_DB_PATH) and one set of resume
+files on a shared volume. The database should use the default rollback journal, not WAL, on
+network filesystems. Leases use wall-clock time, so the hosts' clocks must be roughly in sync.
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app import file_utils, metrics, storage
+
+# Where the app stores uploads for background jobs; must be on the shared volume for multi-host workers
+JOB_FILES_DIR = os.getenv("JOB_FILES_DIR", "job_files")
+DEFAULT_LEASE_SECONDS = 60.0
+MAX_ATTEMPTS = 3
+FINALIZE = "finalize"
+CHUNK = "chunk"
+
+def _connect() -> sqlite3.Connection:
+    # Autocommit mode so claims can use BEGIN IMMEDIATE; a long timeout rides out other workers' writes
+    conn = sqlite3.connect(storage.DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_job_tables():
+    conn = _connect()
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS screening_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_title TEXT NOT NULL,
+                jd_text TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total_files INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                finished_at REAL,
+                session_id INTEGER,
+                error TEXT
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                FOREIGN KEY (job_id) REFERENCES screening_jobs(id) ON DELETE CASCADE
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_job_tasks_claim ON job_tasks (status, lease_expires)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_job_tasks_job ON job_tasks (job_id, status)')
+    finally:
+        conn.close()
+
+# --- Submitting and inspecting jobs ---
+
+def submit_job(resume_paths: List[str], jd_text: str, job_title: str, chunk_size: int = 32) -> Optional[int]:
+    """
+    Queues a screening job and returns its id. Paths are stored as given, so they must be
+    readable by every worker (absolute paths on a shared volume for multi-host runs).
+    """
+    init_job_tables()
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.execute(
+            'INSERT INTO screening_jobs (job_title, jd_text, status, total_files, created_at) VALUES (?, ?, ?, ?, ?)',
+            (job_title, jd_text, "queued", len(resume_paths), now))
+        job_id = cursor.lastrowid
+        paths = [os.path.abspath(p) for p in resume_paths]
+        tasks = [(job_id, CHUNK, json.dumps(paths[i:i + chunk_size]), "pending", now)
+                 for i in range(0, len(paths), chunk_size)]
+        tasks.append((job_id, FINALIZE, "null", "pending", now))
+        conn.executemany(
+            'INSERT INTO job_tasks (job_id, kind, payload, status, updated_at) VALUES (?, ?, ?, ?, ?)', tasks)
+        conn.execute("COMMIT")
+        return job_id
+    except sqlite3.Error as e:
+        print(f"[JOB ERROR] Submitting job failed: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return None
+    finally:
+        conn.close()
+
+def submit_uploads(files: List[tuple], jd_text: str, job_title: str, chunk_size: int = 32) -> Optional[int]:
+    """Writes (filename, content) uploads under JOB_FILES_DIR and queues a job over them."""
+    # Resumes are personal data: keep them out of reach of other local users, like the blob store
+    file_utils.ensure_private_dir(JOB_FILES_DIR)
+    job_dir = file_utils.ensure_private_dir(os.path.join(JOB_FILES_DIR, uuid.uuid4().hex))
+    paths = []
+    for i, (filename, content) in enumerate(files):
+        # Prefixed with the upload position so two uploads with the same name don't collide
+        path = os.path.join(job_dir, f"{i:06d}_{os.path.basename(filename)}")
+        with open(path, "wb") as fh:
+            fh.write(content)
+        paths.append(path)
+    return submit_job(paths, jd_text, job_title, chunk_size)
+
+# Every job with its chunk counts in one pass, so listing jobs doesn't cost a query per job
+_JOB_STATUS_SQL = f'''
+    SELECT j.id, j.job_title, j.status, j.total_files, j.created_at, j.finished_at, j.session_id, j.error,
+           COALESCE(SUM(t.status = 'pending'), 0) AS pending, COALESCE(SUM(t.status = 'leased'), 0) AS leased,
+           COALESCE(SUM(t.status = 'done'), 0) AS done, COALESCE(SUM(t.status = 'failed'), 0) AS failed,
+           COALESCE(SUM(t.status = 'cancelled'), 0) AS cancelled, COUNT(t.id) AS total_chunks
+    FROM screening_jobs j LEFT JOIN job_tasks t ON t.job_id = j.id AND t.kind = '{CHUNK}'
+'''
+_CHUNK_STATES = ("pending", "leased", "done", "failed", "cancelled")
+
+def _status_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    status = {k: row[k] for k in ("id", "job_title", "status", "total_files", "created_at",
+                                  "finished_at", "session_id", "error")}
+    status["chunks"] = {s: row[s] for s in _CHUNK_STATES}
+    total = row["total_chunks"]
+    status["progress"] = round(row["done"] / total, 4) if total else 1.0
+    return status
+
+def job_status(job_id: int) -> Optional[Dict[str, Any]]:
+    init_job_tables()
+    conn = _connect()
+    try:
+        row = conn.execute(_JOB_STATUS_SQL + " WHERE j.id = ? GROUP BY j.id", (job_id,)).fetchone()
+        return _status_from_row(row) if row else None
+    finally:
+        conn.close()
+
+def list_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """The latest jobs with their progress. Read-only: called on every Streamlit rerun."""
+    if not os.path.exists(storage.DB_PATH):
+        return []
+    conn = _connect()
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'screening_jobs'").fetchone():
+            return []
+        rows = conn.execute(_JOB_STATUS_SQL + " GROUP BY j.id ORDER BY j.id DESC LIMIT ?", (limit,)).fetchall()
+        return [_status_from_row(row) for row in rows]
+    except sqlite3.Error as e:
+        print(f"[JOB ERROR] Listing jobs failed: {e}")
+        return []
+    finally:
+        conn.close()
+
+def cancel_job(job_id: int) -> bool:
+    """Stops handing out the job's remaining tasks; chunks already running finish but are discarded."""
+    init_job_tables()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        updated = conn.execute(
+            "UPDATE screening_jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)).rowcount
+        conn.execute("UPDATE job_tasks SET status = 'cancelled', updated_at = ? WHERE job_id = ? AND status IN ('pending', 'leased')",
+                     (time.time(), job_id))
+        conn.execute("COMMIT")
+        if updated:
+            # The finalize task is cancelled too, so nothing else will remove the uploads;
+            # chunks still running just find their files gone and are discarded anyway
+            _remove_job_files(_job_chunks(conn, job_id))
+        return bool(updated)
+    except sqlite3.Error as e:
+        print(f"[JOB ERROR] Cancelling job {job_id} failed: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return False
+    finally:
+        conn.close()
+
+# --- Leases ---
+
+def claim_task(worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+    """
+    Leases the next runnable task: a pending chunk, a chunk whose lease expired, or a job's
+    finalize task once none of its chunks are still pending or leased.
+    """
+    conn = _connect()
+    try:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        # A task whose workers keep dying (e.g. a file that crashes the parser) stops being retried
+        dead_jobs = [row["job_id"] for row in conn.execute(
+            "SELECT job_id FROM job_tasks WHERE kind = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (FINALIZE, now, MAX_ATTEMPTS))]
+        conn.execute(
+            "UPDATE job_tasks SET status = 'failed', error = 'lease expired too many times', updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, MAX_ATTEMPTS))
+        conn.executemany("UPDATE screening_jobs SET status = 'failed', error = 'lease expired too many times', "
+                         "finished_at = ? WHERE id = ?", [(now, job_id) for job_id in dead_jobs])
+        row = conn.execute(f'''
+            SELECT t.* FROM job_tasks t
+            WHERE (t.status = 'pending' OR (t.status = 'leased' AND t.lease_expires < ?))
+              AND (t.kind = '{CHUNK}' OR NOT EXISTS (
+                    SELECT 1 FROM job_tasks c WHERE c.job_id = t.job_id AND c.kind = '{CHUNK}'
+                      AND (c.status = 'pending' OR c.status = 'leased')))
+            ORDER BY t.job_id, t.id
+            LIMIT 1
+        ''', (now,)).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            for job_id in dead_jobs:
+                _remove_job_files(_job_chunks(conn, job_id))
+            return None
+        conn.execute('''
+            UPDATE job_tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?
+            WHERE id = ?
+        ''', (worker_id, now + lease_seconds, now, row["id"]))
+        conn.execute("UPDATE screening_jobs SET status = 'running' WHERE id = ? AND status = 'queued'", (row["job_id"],))
+        conn.execute("COMMIT")
+        for job_id in dead_jobs:
+            _remove_job_files(_job_chunks(conn, job_id))
+        task = dict(row)
+        task["attempts"] += 1
+        return task
+    except sqlite3.Error as e:
+        print(f"[JOB ERROR] Claiming a task failed: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return None
+    finally:
+        conn.close()
+
+def renew_lease(task_id: int, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+    """Extends our lease; False means it was lost (expired and taken over, or the job was cancelled)."""
+    conn = _connect()
+    try:
+        return conn.execute(
+            "UPDATE job_tasks SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + lease_seconds, task_id, worker_id)).rowcount == 1
+    except sqlite3.Error as e:
+        print(f"[JOB ERROR] Renewing lease on task {task_id} failed: {e}")
+        return True   # transient (e.g. locked); the next heartbeat tries again
+    finally:
+        conn.close()
+
+def complete_task(task_id: int, worker_id: str, result: Any) -> bool:
+    """Checkpoints a finished task. Ignored (returns False) if we no longer hold the lease."""
+    conn = _connect()
+    try:
+        return conn.execute(
+            "UPDATE job_tasks SET status = 'done', result = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (json.dumps(result), time.time(), task_id, worker_id)).rowcount == 1
+    except sqlite3.Error as e:
+        # e.g. still locked after the timeout; the lease expires and the task is redone
+        print(f"[JOB ERROR] Completing task {task_id} failed: {e}")
+        return False
+    finally:
+        conn.close()
+
+def fail_task(task: Dict[str, Any], worker_id: str, error: str, max_attempts: int = MAX_ATTEMPTS):
+    """Releases the task for a retry, or marks it failed once it has used up max_attempts."""
+    status = "failed" if task["attempts"] >= max_attempts else "pending"
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        released = conn.execute(
+            "UPDATE job_tasks SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (status, error[:2000], time.time(), task["id"], worker_id)).rowcount
+        job_failed = released and status == "failed" and task["kind"] == FINALIZE
+        if job_failed:
+            conn.execute("UPDATE screening_jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                         (error[:2000], time.time(), task["job_id"]))
+        conn.execute("COMMIT")
+        if job_failed:
+            _remove_job_files(_job_chunks(conn, task["job_id"]))
+    except sqlite3.Error as e:
+        # The lease still expires, so the task is retried (or failed) by the next claim
+        print(f"[JOB ERROR] Releasing task {task['id']} failed: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+def _job_chunks(conn: sqlite3.Connection, job_id: int) -> List[sqlite3.Row]:
+    return conn.execute("SELECT payload, status, result, error FROM job_tasks WHERE job_id = ? AND kind = ?",
+                        (job_id, CHUNK)).fetchall()
+
+def _remove_job_files(chunks) -> None:
+    """Deletes the upload directories submit_uploads made for a job; files submitted by path are left alone."""
+    root = os.path.abspath(JOB_FILES_DIR)
+    job_dirs = {os.path.dirname(p) for c in chunks for p in json.loads(c["payload"])}
+    for job_dir in job_dirs:
+        if os.path.dirname(job_dir) == root:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+class _Heartbeat:
+    """Renews a task's lease every lease_seconds / 3 until stopped; lost is set if renewal is refused."""
+    def __init__(self, task_id: int, worker_id: str, lease_seconds: float):
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(task_id, worker_id, lease_seconds),
+                                        name=f"heartbeat-{task_id}", daemon=True)
+        self._thread.start()
+
+    def _run(self, task_id, worker_id, lease_seconds):
+        while not self._stop.wait(lease_seconds / 3):
+            if not renew_lease(task_id, worker_id, lease_seconds):
+                self.lost.set()
+                return
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+# --- Worker ---
+
+class JobWorker:
+    """Loads the models once, then claims and runs tasks until idle (once=True) or stopped."""
+    def __init__(self, worker_id: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 nlp=None, embedder=None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.nlp, self.embedder = nlp, embedder
+        self._jds: Dict[int, Dict[str, Any]] = {}
+        self.stopped = threading.Event()
+
+    def _models(self):
+        if self.nlp is None:
+            from app import models
+            self.nlp, self.embedder = models.load_models()
+        return self.nlp, self.embedder
+
+    def _parsed_jd(self, job_id: int) -> Dict[str, Any]:
+        if job_id not in self._jds:
+            from app import resume_parser
+            conn = _connect()
+            try:
+                jd_text = conn.execute('SELECT jd_text FROM screening_jobs WHERE id = ?', (job_id,)).fetchone()[0]
+            finally:
+                conn.close()
+            self._jds[job_id] = resume_parser.parse_job_description(jd_text, self._models()[0])
+        return self._jds[job_id]
+
+    def run_chunk(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        from app import file_utils, matcher, resume_parser
+        nlp, embedder = self._models()
+        parsed_jd = self._parsed_jd(task["job_id"])
+        paths = json.loads(task["payload"])
+        texts = [file_utils.extract_text_from_file(p) for p in paths]
+        entries, failures = [], []
+        for path, parsed in zip(paths, resume_parser.parse_resumes(texts, nlp)):
+            if not parsed:
+                failures.append(path)
+                continue
+            parsed["filename"] = os.path.basename(path)
+            entries.append(matcher._ranked_entry(parsed, parsed_jd, embedder))
+        return {"entries": entries, "failures": failures}
+
+    def finalize(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        conn = _connect()
+        try:
+            job = conn.execute('SELECT job_title, session_id FROM screening_jobs WHERE id = ?',
+                               (task["job_id"],)).fetchone()
+            chunks = _job_chunks(conn, task["job_id"])
+        finally:
+            conn.close()
+        results = [json.loads(c["result"]) for c in chunks if c["status"] == "done"]
+        failed = [c for c in chunks if c["status"] == "failed"]
+        summary = {"session_id": job["session_id"], "ranked": sum(len(r["entries"]) for r in results),
+                   "failures": sum(len(r["failures"]) for r in results), "failed_chunks": len(failed)}
+        if job["session_id"] is not None:
+            # An earlier finalize saved the session but lost its lease before checkpointing
+            _remove_job_files(chunks)
+            return summary
+        error = None
+        if failed:
+            # Save what did get screened, but record that the session is missing resumes
+            missing = sum(len(json.loads(c["payload"])) for c in failed)
+            error = (f"{len(failed)} of {len(chunks)} chunks failed; {missing} resumes are not in the session "
+                     f"(first error: {failed[0]['error']})")
+        ranked = sorted((e for r in results for e in r["entries"]), key=lambda e: e["score"], reverse=True)
+        summary["session_id"] = self._save_session(task, ranked, job["job_title"], error)
+        _remove_job_files(chunks)
+        return summary
+
+    def _save_session(self, task: Dict[str, Any], ranked: List[Dict[str, Any]], job_title: str,
+                      error: Optional[str] = None) -> int:
+        """
+        Saves the ranked session and links it to the job in one transaction, only while we still
+        hold the finalize lease and no other worker has saved it, so a job gets exactly one session.
+        """
+        conn = _connect()
+        try:
+            with metrics.timer("db_write"):
+                conn.execute("BEGIN IMMEDIATE")
+                held = conn.execute(
+                    "SELECT 1 FROM job_tasks t JOIN screening_jobs j ON j.id = t.job_id "
+                    "WHERE t.id = ? AND t.lease_owner = ? AND t.status = 'leased' AND j.session_id IS NULL",
+                    (task["id"], self.worker_id)).fetchone()
+                if held is None:
+                    conn.execute("ROLLBACK")
+                    raise RuntimeError("lost the finalize lease or the job was already saved")
+                session_id = storage._insert_session(conn.cursor(), ranked, job_title, storage._now_timestamp())
+                conn.execute("UPDATE screening_jobs SET status = ?, session_id = ?, error = ?, finished_at = ? WHERE id = ?",
+                             ("partial" if error else "done", session_id, error and error[:2000], time.time(),
+                              task["job_id"]))
+                conn.execute("COMMIT")
+            return session_id
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise RuntimeError(f"saving results failed: {e}") from e
+        finally:
+            conn.close()
+
+    def run_task(self, task: Dict[str, Any]) -> bool:
+        heartbeat = _Heartbeat(task["id"], self.worker_id, self.lease_seconds)
+        try:
+            with metrics.timer(f"job_{task['kind']}"):
+                result = self.run_chunk(task) if task["kind"] == CHUNK else self.finalize(task)
+        except Exception as e:
+            heartbeat.stop()
+            print(f"[JOB ERROR] Task {task['id']} ({task['kind']}) of job {task['job_id']} failed: {e}", file=sys.stderr)
+            fail_task(task, self.worker_id, f"{type(e).__name__}: {e}")
+            return False
+        heartbeat.stop()
+        if heartbeat.lost.is_set() or not complete_task(task["id"], self.worker_id, result):
+            print(f"[JOB ERROR] Lost the lease on task {task['id']}; result discarded", file=sys.stderr)
+            return False
+        return True
+
+    def run(self, once: bool = False, poll_interval: float = 2.0) -> int:
+        """Runs tasks until stopped; with once=True, returns when no task is runnable. Returns tasks completed."""
+        init_job_tables()
+        storage.init_db()
+        completed = 0
+        while not self.stopped.is_set():
+            task = claim_task(self.worker_id, self.lease_seconds)
+            if task is None:
+                if once:
+                    break
+                self.stopped.wait(poll_interval)
+                continue
+            completed += self.run_task(task)
+        return completed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durable, resumable screening jobs shared by any number of workers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit = sub.add_parser("submit", help="Queue a screening job")
+    submit.add_argument("--resumes", required=True, help="Resume file or directory (searched recursively)")
+    submit.add_argument("--jd", required=True, help="Job description file")
+    submit.add_argument("--title", default="", help="Job title (default: JD file name)")
+    submit.add_argument("--chunk-size", type=int, default=32, help="Resumes per task")
+    worker = sub.add_parser("worker", help="Claim and run tasks")
+    worker.add_argument("--once", action="store_true", help="Exit when no task is runnable")
+    worker.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS, help="Lease length in seconds")
+    status = sub.add_parser("status", help="Show job progress")
+    status.add_argument("job_id", type=int, nargs="?")
+    cancel = sub.add_parser("cancel", help="Cancel a job")
+    cancel.add_argument("job_id", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        from app import file_utils
+        from app.batch_screening import find_documents
+        jd_text = file_utils.extract_text_from_file(args.jd)
+        paths = find_documents(args.resumes)
+        if not jd_text.strip() or not paths:
+            print("Nothing to screen: need a readable JD and at least one resume.", file=sys.stderr)
+            return 1
+        title = args.title or os.path.splitext(os.path.basename(args.jd))[0]
+        job_id = submit_job(paths, jd_text, title, args.chunk_size)
+        if job_id is None:
+            return 1
+        print(f"Submitted job {job_id}: {len(paths)} resumes")
+    elif args.command == "worker":
+        job_worker = JobWorker(lease_seconds=args.lease)
+        print(f"Worker {job_worker.worker_id} started", file=sys.stderr)
+        try:
+            completed = job_worker.run(once=args.once)
+            print(f"Worker {job_worker.worker_id} completed {completed} tasks", file=sys.stderr)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "status":
+        jobs = [job_status(args.job_id)] if args.job_id else list_jobs()
+        for job in filter(None, jobs):
+            print(json.dumps(job))
+    elif args.command == "cancel":
+        if not cancel_job(args.job_id):
+            print(f"Job {args.job_id} is not queued or running.", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,19 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from typing import Dict, List, Any
+import heapq
+import time
+from typing import Dict, Iterator, List, Any
+
+from app import metrics
 
 
 def compute_semantic_similarity(text1: str, text2: str, embedder) -> float:
     if not text1 or not text2:
         return 0.0
-    embeddings = embedder.encode([text1, text2])
+    # Imported on first use: sklearn adds noticeably to app start-up
+    from sklearn.metrics.pairwise import cosine_similarity
+    with metrics.timer("embed"):
+        embeddings = embedder.encode([text1, text2])
+    metrics.inc("encode_calls_total")
+    metrics.inc("encoded_texts_total", 2)
     score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
     return round(float(score * 100), 2)
 
@@ -30,7 +36,10 @@ def _score_skills(resume_skills, jd_skills, embedder):
     overlap_score = (matched_count / len(jd_skills)) * 100 if jd_skills else 0.0
     return min(0.7 * sem_score + 0.3 * overlap_score, 100.0)
 
-def calculate_match_score(parsed_resume, parsed_jd, embedder, weights=None):
+SCORE_COMPONENTS = ["skills", "experience", "education", "overall_text"]
+
+@metrics.timed("score")
+def calculate_score_breakdown(parsed_resume, parsed_jd, embedder, weights=None) -> Dict[str, float]:
     if weights is None:
         weights = {"skills":0.6,"experience":0.3,"education":0.1,"overall_text":0.0}
     total_weight = sum(weights.values())
@@ -42,16 +51,51 @@ def calculate_match_score(parsed_resume, parsed_jd, embedder, weights=None):
         "education": _score_education(parsed_resume.get("education", []), parsed_jd.get("education_requirements",[])),
         "overall_text": compute_semantic_similarity(parsed_resume.get("full_text",""), parsed_jd.get("full_text",""), embedder)
     }
-    final_score = sum(scores[k] * weights[k] for k in weights)
-    return round(final_score, 2)
+    breakdown = {k: round(float(v), 2) for k, v in scores.items()}
+    breakdown["final"] = round(sum(scores[k] * weights[k] for k in weights), 2)
+    metrics.inc("documents_total", kind="scored")
+    return breakdown
+
+def calculate_match_score(parsed_resume, parsed_jd, embedder, weights=None):
+    return calculate_score_breakdown(parsed_resume, parsed_jd, embedder, weights)["final"]
+
+def _ranked_entry(data, parsed_jd, embedder, weights=None) -> Dict[str, Any]:
+    breakdown = calculate_score_breakdown(data, parsed_jd, embedder, weights)
+    return {"filename": data.get('filename','Unknown'), "score": breakdown.pop("final"),
+            "score_breakdown": breakdown, "parsed_data": data}
 
 def rank_resumes(resumes_parsed_data: List[Dict[str, Any]], parsed_jd: Dict[str, Any], embedder) -> List[Dict[str, Any]]:
     return sorted(
-        [{"filename": data.get('filename','Unknown'), "score": calculate_match_score(data, parsed_jd, embedder), "parsed_data": data}
-        for data in resumes_parsed_data],
+        [_ranked_entry(data, parsed_jd, embedder) for data in resumes_parsed_data],
         key=lambda x: x['score'], reverse=True
     )
 
+def iter_rank_resumes(resumes_parsed_data: List[Dict[str, Any]], parsed_jd: Dict[str, Any], embedder,
+                      chunk_size: int = 25, top_k: int = 10, weights=None) -> Iterator[Dict[str, Any]]:
+    """
+    Scores resumes a chunk at a time, yielding after each chunk:
+    {"scored", "total", "entries" (this chunk, input order), "top" (live top_k, best first), "elapsed", "eta"}.
+    Stop iterating (or close() the generator) to cancel; nothing is scored past the current chunk.
+    """
+    total = len(resumes_parsed_data)
+    heap = []   # min-heap of (score, -index, entry) holding the best top_k so far
+    start = time.perf_counter()
+    for offset in range(0, total, chunk_size):
+        entries = []
+        for i, data in enumerate(resumes_parsed_data[offset:offset + chunk_size], offset):
+            entry = _ranked_entry(data, parsed_jd, embedder, weights)
+            entries.append(entry)
+            item = (entry["score"], -i, entry)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif top_k and item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        scored = offset + len(entries)
+        elapsed = time.perf_counter() - start
+        yield {"scored": scored, "total": total, "entries": entries,
+               "top": [e for _, _, e in sorted(heap, key=lambda x: x[:2], reverse=True)],
+               "elapsed": elapsed, "eta": elapsed / scored * (total - scored)}
+
 
 def _score_experience(resume_years: float, jd_years: int):
     if jd_years == 0:
@@ -0,0 +1,281 @@
+"""
+In-process instrumentation for the screening pipeline: counters, per-stage timing histograms,
+Prometheus text / JSON output, and an opt-in cProfile + tracemalloc capture for one run.
+
+    with metrics.timer("parse"):
+        ...
+    metrics.inc("documents_total", kind="parsed")
+
+Every metric name gets the resume_screening_ prefix. Stages nest (e.g. "score" includes the
+"embed" calls it makes), so stage totals overlap rather than sum to wall time. Metrics are per
+process; batch workers and the model worker keep their own.
+"""
+import functools
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+PREFIX = "resume_screening_"
+STAGE_METRIC = "stage_seconds"
+# Seconds; spans a single cosine similarity up to a large PDF report
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DESCRIPTIONS = {
+    "stage_seconds": "Time spent per pipeline stage",
+    "documents_total": "Documents processed, by kind (extracted, parsed, scored)",
+    "encode_calls_total": "Calls to embedder.encode",
+    "encoded_texts_total": "Texts passed to embedder.encode",
+    "cache_hits_total": "Cache hits, by cache",
+    "cache_misses_total": "Cache misses, by cache",
+    "db_rows_written_total": "Result rows written to the database",
+    "emails_total": "Email reports delivered or given up on, by status",
+    "errors_total": "Errors, by stage",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class _Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets, interpolating linearly within the bucket that holds q."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.buckets + (self.max,), self.counts):
+            if n and seen + n >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = bound
+        return self.max
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                        for name, series in self._counters.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = [{
+                    "labels": dict(key),
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "avg": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "p50": round(h.quantile(0.50), 6),
+                    "p95": round(h.quantile(0.95), 6),
+                    "p99": round(h.quantile(0.99), 6),
+                    "max": round(h.max, 6),
+                    "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                } for key, h in series.items()]
+        return {"counters": counters, "histograms": histograms}
+
+    def prometheus_text(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in series.items():
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, n in zip([f"{b:g}" for b in h.buckets] + ["+Inf"], h.counts):
+                        cumulative += n
+                        lines.append(f"{full}_bucket{_format_labels(key + (('le', bound),))} {cumulative}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {h.sum:.6f}")
+                    lines.append(f"{full}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in key) + "}"
+
+REGISTRY = Registry()
+
+def inc(name: str, value: float = 1.0, **labels):
+    REGISTRY.inc(name, value, **labels)
+
+def observe(name: str, value: float, **labels):
+    REGISTRY.observe(name, value, **labels)
+
+@contextmanager
+def timer(stage: str, **labels) -> Iterator[None]:
+    """Records the block's duration in the stage_seconds histogram, and counts it in errors_total if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REGISTRY.inc("errors_total", stage=stage)
+        raise
+    finally:
+        REGISTRY.observe(STAGE_METRIC, time.perf_counter() - start, stage=stage, **labels)
+
+def timed(stage: str):
+    """Decorator form of timer()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def snapshot() -> Dict[str, Any]:
+    return REGISTRY.snapshot()
+
+def prometheus_text() -> str:
+    return REGISTRY.prometheus_text()
+
+def reset():
+    REGISTRY.reset()
+
+def stage_summary() -> List[Dict[str, Any]]:
+    """One row per stage (count, total and latency percentiles in ms), slowest total first."""
+    rows = []
+    for series in REGISTRY.snapshot()["histograms"].get(STAGE_METRIC, []):
+        rows.append({
+            "stage": series["labels"].get("stage", ""),
+            "count": series["count"],
+            "total_s": round(series["sum"], 3),
+            "avg_ms": round(series["avg"] * 1000, 2),
+            "p50_ms": round(series["p50"] * 1000, 2),
+            "p95_ms": round(series["p95"] * 1000, 2),
+            "max_ms": round(series["max"] * 1000, 2),
+        })
+    return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+# --- Profiling ---
+
+@contextmanager
+def profile(enabled: bool = True, top: int = 30) -> Iterator[Dict[str, Any]]:
+    """
+    Captures a cProfile and tracemalloc profile of the block when enabled. Yields a dict that is
+    filled in on exit with "cpu" (pstats text, by cumulative time), "memory" (top allocation sites)
+    and "peak_bytes". tracemalloc slows Python code down considerably; use it for one run at a time.
+    """
+    report: Dict[str, Any] = {}
+    if not enabled:
+        yield report
+        return
+    import cProfile
+    import pstats
+    import tracemalloc
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        report["seconds"] = round(time.perf_counter() - start, 3)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        report["cpu"] = out.getvalue()
+        memory_snapshot = tracemalloc.take_snapshot()
+        report["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        report["memory"] = [{"site": str(stat.traceback[0]), "size_kib": round(stat.size / 1024, 1),
+                             "count": stat.count}
+                            for stat in memory_snapshot.statistics("lineno")[:top]]
+        if started_tracing:
+            tracemalloc.stop()
+
+def profiling_requested() -> bool:
+    return os.getenv("SCREENING_PROFILE", "").lower() in ("1", "true", "yes")
+
+# --- HTTP endpoint ---
+
+def make_handler(registry: Registry = REGISTRY):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = registry.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                import json
+                body, content_type = json.dumps(registry.snapshot()).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def start_http_server(port: int, host: str = "127.0.0.1"):
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread; returns the server or None."""
+    from http.server import ThreadingHTTPServer
+    try:
+        server = ThreadingHTTPServer((host, port), make_handler())
+    except OSError as e:
+        print(f"[METRICS ERROR] Could not listen on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
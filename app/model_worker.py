@@ -0,0 +1,251 @@
+"""
+Shared model worker: one process holding spaCy and the sentence embedder for every
+Streamlit session (and every Streamlit server process on the host).
+
+    python -m app.model_worker [--address /path/to/worker.sock]
+
+Clients talk to it over a local socket (multiprocessing.connection). Concurrent requests
+from all sessions are micro-batched into shared encode / nlp.pipe calls, and large embedding
+arrays come back through shared memory instead of being pickled over the socket.
+ModelWorkerClient.encode() matches SentenceTransformer.encode(), so the client can be passed
+to matcher functions as the embedder.
+
+Connections are authenticated with MODEL_WORKER_AUTHKEY if set, otherwise with a random key
+generated on first use and kept (mode 0600) next to the default socket in a per-user directory
+(mode 0700) under the temp dir. Messages are pickled, so anyone holding the key can run code in
+the worker; set MODEL_WORKER_AUTHKEY explicitly for TCP addresses shared across users or hosts.
+"""
+import argparse
+import getpass
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List
+
+from app.file_utils import ensure_private_dir
+
+SHARED_MEMORY_MIN_BYTES = 64 * 1024   # smaller arrays are cheaper to pickle inline
+
+def private_dir() -> str:
+    """Per-user directory (mode 0700) for the socket and key; refuses one another user created."""
+    return ensure_private_dir(os.path.join(tempfile.gettempdir(), f"resume_model_worker-{getpass.getuser()}"))
+
+def default_address():
+    if os.getenv("MODEL_WORKER_ADDRESS"):
+        return parse_address(os.getenv("MODEL_WORKER_ADDRESS"))
+    if sys.platform == "win32":
+        return ("127.0.0.1", 6123)
+    return os.path.join(private_dir(), "worker.sock")
+
+def parse_address(value: str):
+    """'host:port' for TCP, anything else is a Unix socket path."""
+    host, _, port = value.rpartition(":")
+    if host and port.isdigit():
+        return (host, int(port))
+    return value
+
+def _authkey() -> bytes:
+    if os.getenv("MODEL_WORKER_AUTHKEY"):
+        return os.getenv("MODEL_WORKER_AUTHKEY").encode("utf-8")
+    path = os.path.join(private_dir(), "authkey")
+    try:
+        # O_EXCL: whichever of the app and the worker gets here first writes the key, the other reads it
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(50):
+            with open(path, "rb") as fh:
+                key = fh.read()
+            if key:
+                return key
+            time.sleep(0.01)   # the creator hasn't written it yet
+        raise RuntimeError(f"Model worker key file {path} is empty")
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(key)
+    return key
+
+# --- Server ---
+
+class ModelWorkerServer:
+    def __init__(self, nlp, embedder, address=None, max_batch_size: int = 64, max_latency: float = 0.005):
+        from app.scoring_service import InFlight, MicroBatcher, parse_batch
+        self.nlp = nlp
+        self.address = address or default_address()
+        self.in_flight = InFlight()
+        self.encode_batcher = MicroBatcher(lambda texts: list(embedder.encode(texts)),
+                                           max_batch_size, max_latency, name="worker-encode", busy=self.in_flight)
+        self.parse_batcher = MicroBatcher(lambda items: parse_batch(items, nlp), max_batch_size, max_latency,
+                                          name="worker-parse", busy=self.in_flight)
+        self.connections = 0
+
+    def _encode(self, texts: List[str]):
+        import numpy as np
+        futures = [self.encode_batcher.submit(t) for t in texts]
+        array = np.stack([f.result() for f in futures]) if futures else np.zeros((0, 0), dtype=np.float32)
+        if array.nbytes < SHARED_MEMORY_MIN_BYTES:
+            return ("inline", array)
+        shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+        # The client unlinks the block after copying it out; stop our tracker from "cleaning it up" too
+        resource_tracker.unregister(shm._name, "shared_memory")
+        shm.close()
+        return ("shm", shm.name, array.shape, array.dtype.str)
+
+    def handle(self, request: tuple):
+        from app.scoring_service import check_text
+        op, payload = request
+        with self.in_flight.track():
+            if op == "encode":
+                return self._encode([check_text(t) for t in payload])
+            if op == "parse_resume":
+                return self.parse_batcher(("resume", check_text(payload)))
+            if op == "parse_resumes":
+                futures = [self.parse_batcher.submit(("resume", t)) for t in [check_text(t) for t in payload]]
+                return [f.result() for f in futures]
+            if op == "parse_jd":
+                return self.parse_batcher(("jd", check_text(payload)))
+        if op == "stats":
+            from app import metrics
+            return {"connections": self.connections, "encode": self.encode_batcher.stats(),
+                    "parse": self.parse_batcher.stats(), "metrics": metrics.snapshot()}
+        if op == "ping":
+            return "pong"
+        raise ValueError(f"Unknown model worker op: {op}")
+
+    def _serve_connection(self, conn):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(("ok", self.handle(request)))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            self.connections -= 1
+            conn.close()
+
+    def serve_forever(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            # A socket file left behind by a crashed worker blocks bind(); remove it if nobody answers
+            if _ping(self.address):
+                raise RuntimeError(f"A model worker is already running at {self.address}")
+            os.remove(self.address)
+        with Listener(self.address, authkey=_authkey()) as listener:
+            print(f"Model worker listening on {self.address}", flush=True)
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"[WORKER ERROR] Rejected connection: {e}", file=sys.stderr)
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+# --- Client ---
+
+class ModelWorkerError(RuntimeError):
+    pass
+
+class ModelWorkerClient:
+    """Thread-safe client; each thread gets its own connection to the worker."""
+    def __init__(self, address=None):
+        self.address = address or default_address()
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, authkey=_authkey())
+            self._local.conn = conn
+        return conn
+
+    def _call(self, op: str, payload=None):
+        for attempt in range(2):
+            try:
+                conn = self._conn()
+                conn.send((op, payload))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError):
+                # Worker restarted or connection dropped; reconnect once
+                self._local.conn = None
+                if attempt:
+                    raise
+        if status == "error":
+            raise ModelWorkerError(result)
+        return result
+
+    def encode(self, sentences, **kwargs):
+        import numpy as np
+        single = isinstance(sentences, str)
+        result = self._call("encode", [sentences] if single else list(sentences))
+        if result[0] == "inline":
+            array = result[1]
+        else:
+            _, name, shape, dtype = result
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf).copy()
+            finally:
+                shm.close()
+                shm.unlink()
+        return array[0] if single else array
+
+    def parse_resume(self, full_text: str) -> Dict[str, Any]:
+        return self._call("parse_resume", full_text) if full_text else {}
+
+    def parse_resumes(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self._call("parse_resumes", list(texts))
+
+    def parse_job_description(self, jd_text: str) -> Dict[str, Any]:
+        return self._call("parse_jd", jd_text) if jd_text else {}
+
+    def stats(self) -> Dict[str, Any]:
+        return self._call("stats")
+
+def _ping(address) -> bool:
+    try:
+        return ModelWorkerClient(address)._call("ping") == "pong"
+    except Exception:
+        return False
+
+def ensure_worker(address=None, timeout: float = 300.0) -> ModelWorkerClient:
+    """
+    Returns a client for the worker at address, starting a detached worker process first
+    if none is answering. Several Streamlit processes racing here end up sharing one worker.
+    """
+    address = address or default_address()
+    if not _ping(address):
+        env = dict(os.environ, MODEL_WORKER_ADDRESS=address if isinstance(address, str) else f"{address[0]}:{address[1]}")
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.Popen([sys.executable, "-m", "app.model_worker"], cwd=project_root, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        deadline = time.monotonic() + timeout
+        while not _ping(address):
+            if time.monotonic() > deadline:
+                raise ModelWorkerError(f"Model worker at {address} did not start within {timeout:.0f}s")
+            time.sleep(0.5)
+    return ModelWorkerClient(address)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve parse/encode requests for all screening sessions.")
+    parser.add_argument("--address", default=None, help="Unix socket path or host:port")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    from app import models
+    nlp, embedder = models.load_models()
+    address = parse_address(args.address) if args.address else default_address()
+    ModelWorkerServer(nlp, embedder, address, args.max_batch, args.max_latency_ms / 1000).serve_forever()
+
+if __name__ == "__main__":
+    main()
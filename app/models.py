@@ -0,0 +1,26 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Tuple
+
+# Lightweight models for Cloud deployment; en_core_web_sm must be in requirements.txt
+SPACY_MODEL = "en_core_web_sm"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+def load_models(spacy_model: str = SPACY_MODEL, embedding_model: str = EMBEDDING_MODEL) -> Tuple:
+    """Loads the spaCy pipeline and sentence embedder shared by parsing and matching."""
+    import spacy
+    from sentence_transformers import SentenceTransformer
+    nlp = spacy.load(spacy_model)
+    embedder = SentenceTransformer(embedding_model)
+    return nlp, embedder
+
+def load_models_in_background(loader: Callable[[], Tuple] = load_models) -> Future:
+    """Starts loader() on a daemon thread; the returned Future resolves to its (nlp, embedder)."""
+    future = Future()
+    def _load():
+        try:
+            future.set_result(loader())
+        except Exception as e:
+            future.set_exception(e)
+    threading.Thread(target=_load, name="model-warmup", daemon=True).start()
+    return future
@@ -1,15 +1,60 @@
 from fpdf import FPDF
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import getpass
+import hashlib
 import os
+import shutil
+import statistics
 import sys
 import tempfile
 
+from app import metrics
+from app.file_utils import ensure_private_dir
+
+REPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), f"resume_screening_reports-{getpass.getuser()}")
+REPORT_CACHE_MAX_FILES = 32
+
+TABLE_COLUMNS = [("Candidate Resume", 80), ("Score (%)", 30), ("Key Skills Found", 80)]
+ROW_HEIGHT = 7
+
+class _PDFBuffer:
+    """Append-only stand-in for FPDF's str buffer, so assembling large documents isn't quadratic."""
+    def __init__(self, initial: str = ""):
+        self._parts = [initial] if initial else []
+        self._length = len(initial)
+    def __iadd__(self, s):
+        self._parts.append(s)
+        self._length += len(s)
+        return self
+    def __len__(self):
+        return self._length
+    def __str__(self):
+        return "".join(self._parts)
+    def encode(self, encoding="latin1"):
+        return str(self).encode(encoding)
+    def write_to(self, fh, encoding="latin1"):
+        for part in self._parts:
+            fh.write(part.encode(encoding))
+
 class ResumeReportPDF(FPDF):
+    table_title = ""
+
+    @property
+    def buffer(self):
+        return self._buffer
+    @buffer.setter
+    def buffer(self, value):
+        self._buffer = value if isinstance(value, _PDFBuffer) else _PDFBuffer(value)
+
     def header(self):
         # Remove emoji for compatibility
         self.set_font("Helvetica", 'B', 15)
         self.cell(0, 10, "AI Resume Screening Report", 0, 1, 'C')
         self.ln(5)
+        # Page breaks inside the candidate table repeat its header row
+        if self.table_title:
+            self.chapter_title(f"{self.table_title} (Cont.):")
+            self.table_header()
     def footer(self):
         self.set_y(-15)
         self.set_font("Helvetica", 'I', 8)
@@ -22,15 +67,72 @@ class ResumeReportPDF(FPDF):
         self.set_font("Helvetica", '', 10)
         self.multi_cell(0, 5, body)
         self.ln(5)
+    def table_header(self):
+        self.set_font("Helvetica", 'B', 10)
+        for i, (label, width) in enumerate(TABLE_COLUMNS):
+            self.cell(width, ROW_HEIGHT, label, 1, 1 if i == len(TABLE_COLUMNS) - 1 else 0, 'C')
+        self.set_font("Helvetica", '', 9)
+    def table_row(self, values):
+        for i, ((_, width), value) in enumerate(zip(TABLE_COLUMNS, values)):
+            self.cell(width, ROW_HEIGHT, self.fit_text(value, width), 1,
+                      1 if i == len(TABLE_COLUMNS) - 1 else 0, 'C' if i == 1 else 'L')
+    def fit_text(self, text, width):
+        # Single-line cells keep rows aligned; truncate instead of wrapping
+        text = str(text)
+        max_width = width - 2 * self.c_margin
+        # Nothing longer than max_width / (narrowest glyph, "'") can fit, so measure at most that much
+        text = text[:int(max_width / self.get_string_width("'")) + 1]
+        if self.get_string_width(text) <= max_width:
+            return text
+        # Longest prefix that fits with the ellipsis, by binary search: O(len log len) per cell
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.get_string_width(text[:mid] + "...") <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo] + "..."
+    def save(self, output_path):
+        if self.state < 3:
+            self.close()
+        with open(output_path, "wb") as fh:
+            self.buffer.write_to(fh)
 
+def _latin1(text) -> str:
+    # Core Helvetica font is latin-1 only
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+def summarize_scores(ranked_resumes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    scores = [float(r.get("score", 0.0)) for r in ranked_resumes if isinstance(r.get("score"), (int, float))]
+    if not scores:
+        return {"count": 0}
+    return {
+        "count": len(scores),
+        "mean": round(statistics.fmean(scores), 2),
+        "median": round(statistics.median(scores), 2),
+        "min": round(min(scores), 2),
+        "max": round(max(scores), 2),
+        "bands": {
+            "80-100": sum(1 for s in scores if s >= 80),
+            "60-79": sum(1 for s in scores if 60 <= s < 80),
+            "40-59": sum(1 for s in scores if 40 <= s < 60),
+            "0-39": sum(1 for s in scores if s < 40),
+        },
+    }
+
+@metrics.timed("pdf")
 def export_results_to_pdf(
     ranked_resumes: List[Dict[str, Any]],
     job_description_data: Dict[str, Any],
     output_path: str = "",
-    job_title: str = ""
+    job_title: str = "",
+    top_n: Optional[int] = None
 ) -> str:
-    import tempfile
-
+    """
+    Renders the ranking report. With top_n, only the best top_n candidates are listed
+    and a score summary over all candidates is added, which keeps large reports small.
+    """
     if not isinstance(ranked_resumes, list) or not isinstance(job_description_data, dict):
         print("[ERROR] Input data to PDF exporter is invalid.")
         return ""
@@ -41,7 +143,7 @@ def export_results_to_pdf(
         pdf.add_page()
 
         pdf.set_font("Helvetica", 'B', 14)
-        pdf.cell(0, 10, f"Job Role: {job_title or 'N/A'}", 0, 1, 'C')
+        pdf.cell(0, 10, _latin1(f"Job Role: {job_title or 'N/A'}"), 0, 1, 'C')
         pdf.ln(5)
 
         pdf.chapter_title("Job Description Summary:")
@@ -50,37 +152,42 @@ def export_results_to_pdf(
             f"Experience Required: {job_description_data.get('experience_requirements', 'N/A')} years\n"
             f"Education Requirements: {', '.join(job_description_data.get('education_requirements', ['N/A']))}\n"
         )
-        pdf.chapter_body(jd_summary_text)
+        pdf.chapter_body(_latin1(jd_summary_text))
         pdf.ln(5)
 
-        pdf.chapter_title("Ranked Candidates:")
-        pdf.set_font("Helvetica", 'B', 10)
-        pdf.cell(80, 7, "Candidate Resume", 1, 0, 'C')
-        pdf.cell(30, 7, "Score (%)", 1, 0, 'C')
-        pdf.cell(80, 7, "Key Skills Found", 1, 1, 'C')
+        if top_n is not None:
+            summary = summarize_scores(ranked_resumes)
+            pdf.chapter_title("Score Summary:")
+            if summary["count"]:
+                bands = ", ".join(f"{band}: {n}" for band, n in summary["bands"].items())
+                pdf.chapter_body(
+                    f"Candidates screened: {summary['count']}\n"
+                    f"Mean score: {summary['mean']}  Median: {summary['median']}  "
+                    f"Min: {summary['min']}  Max: {summary['max']}\n"
+                    f"Score bands: {bands}\n"
+                )
+            else:
+                pdf.chapter_body("No scored candidates.")
+            rows = ranked_resumes[:top_n]
+            table_title = f"Top {len(rows)} of {len(ranked_resumes)} Candidates"
+        else:
+            rows = ranked_resumes
+            table_title = "Ranked Candidates"
 
-        pdf.set_font("Helvetica", '', 9)
-        if not ranked_resumes:
+        pdf.chapter_title(f"{table_title}:")
+        pdf.table_header()
+        if not rows:
             pdf.cell(0, 10, "No candidates matched or parsed.", 1, 1, 'C')
         else:
-            for res in ranked_resumes:
-                filename = res.get("filename", "N/A")
-                score = res.get("score", "N/A")
-                parsed_data = res.get("parsed_data", {})
-                skills_list = parsed_data.get("skills", [])
-                skills_str = ", ".join(skills_list)
-                skills = (skills_str[:75] + "...") if len(skills_str) > 75 else skills_str
-                pdf.cell(80, 7, filename, 1, 0)
-                pdf.cell(30, 7, str(score), 1, 0, 'C')
-                pdf.multi_cell(80, 7, skills, 1, 'L', False)
-                if pdf.get_y() + 10 > pdf.h - pdf.b_margin:
-                    pdf.add_page()
-                    pdf.chapter_title("Ranked Candidates (Cont.):")
-                    pdf.set_font("Helvetica", 'B', 10)
-                    pdf.cell(80, 7, "Candidate Resume", 1, 0, 'C')
-                    pdf.cell(30, 7, "Score (%)", 1, 0, 'C')
-                    pdf.cell(80, 7, "Key Skills Found", 1, 1, 'C')
-                    pdf.set_font("Helvetica", '', 9)
+            pdf.table_title = table_title
+            for res in rows:
+                skills_list = res.get("parsed_data", {}).get("skills", [])
+                pdf.table_row((
+                    _latin1(res.get("filename", "N/A")),
+                    res.get("score", "N/A"),
+                    _latin1(", ".join(skills_list)),
+                ))
+            pdf.table_title = ""
 
         # Use a temp file for output
         if not output_path:
@@ -88,7 +195,7 @@ def export_results_to_pdf(
             output_path = tmp.name
             tmp.close()
 
-        pdf.output(output_path)
+        pdf.save(output_path)
         if os.path.exists(output_path):
             print(f"[DEBUG] PDF successfully written at: {output_path}")
             return output_path
@@ -98,3 +205,58 @@ def export_results_to_pdf(
     except Exception as e:
         print(f"[PDF ERROR] Exception during PDF creation: {e}", file=sys.stderr)
         return ""
+
+# --- Report cache: one render shared by download and email ---
+
+def results_hash(ranked_resumes: List[Dict[str, Any]], job_description_data: Dict[str, Any],
+                 job_title: str = "", top_n: Optional[int] = None) -> str:
+    h = hashlib.sha1()
+    h.update(f"{job_title}|{top_n}|{job_description_data.get('full_text', '')}\n".encode("utf-8"))
+    for res in ranked_resumes:
+        skills = ",".join(res.get("parsed_data", {}).get("skills", []))
+        h.update(f"{res.get('filename', '')}|{res.get('score', '')}|{skills}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def get_or_create_report(
+    ranked_resumes: List[Dict[str, Any]],
+    job_description_data: Dict[str, Any],
+    session_id: str,
+    job_title: str = "",
+    top_n: Optional[int] = None
+) -> str:
+    """
+    Returns a cached report path for (session_id, results hash), rendering it only on a miss.
+    Callers must not delete the returned file; the cache evicts old reports itself.
+    """
+    # Reports list candidate names and scores: keep the cache private to this user
+    ensure_private_dir(REPORT_CACHE_DIR)
+    key = hashlib.sha1(
+        f"{session_id}|{results_hash(ranked_resumes, job_description_data, job_title, top_n)}".encode("utf-8")
+    ).hexdigest()
+    cached_path = os.path.join(REPORT_CACHE_DIR, f"Report_{key[:16]}.pdf")
+    if os.path.exists(cached_path):
+        metrics.inc("cache_hits_total", cache="report")
+        os.utime(cached_path)
+        return cached_path
+    metrics.inc("cache_misses_total", cache="report")
+    # Render to a temp name and rename, so a concurrent reader never sees a half-written report
+    tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+    if not export_results_to_pdf(ranked_resumes, job_description_data, tmp_path, job_title, top_n):
+        return ""
+    os.replace(tmp_path, cached_path)
+    _evict_reports()
+    return cached_path
+
+def _evict_reports():
+    try:
+        reports = sorted(
+            (os.path.join(REPORT_CACHE_DIR, f) for f in os.listdir(REPORT_CACHE_DIR) if f.endswith(".pdf")),
+            key=os.path.getmtime, reverse=True
+        )
+        for path in reports[REPORT_CACHE_MAX_FILES:]:
+            os.remove(path)
+    except OSError as e:
+        print(f"[PDF ERROR] Report cache eviction failed: {e}", file=sys.stderr)
+
+def clear_report_cache():
+    shutil.rmtree(REPORT_CACHE_DIR, ignore_errors=True)
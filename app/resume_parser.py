@@ -1,9 +1,9 @@
-import spacy
-from spacy.matcher import PhraseMatcher
 import re
 from datetime import datetime
 from typing import List, Dict, Any
 
+from app import metrics
+
 # Efficient, dynamically extendable skill list
 DEFAULT_SKILLS = [
     # (abbreviated for brevity—extend or load dynamically as needed)
@@ -11,7 +11,10 @@ DEFAULT_SKILLS = [
     # ...
 ]
 
+@metrics.timed("skill_match")
 def _extract_skills_from_doc(doc, skillset, nlp) -> List[str]:
+    # spaCy is already loaded by whoever built nlp; importing here keeps this module cheap to import
+    from spacy.matcher import PhraseMatcher
     matcher = PhraseMatcher(nlp.vocab)
     patterns = [nlp.make_doc(skill) for skill in skillset]
     matcher.add("SKILL_PATTERNS", patterns)
@@ -192,7 +195,24 @@ def _extract_contact_info(doc):
 def parse_resume(full_text: str, nlp) -> Dict[str, Any]:
     if not full_text:
         return {}
-    doc = nlp(full_text)
+    with metrics.timer("parse"):
+        metrics.inc("documents_total", kind="parsed")
+        return _parse_resume_doc(nlp(full_text), full_text, nlp)
+
+
+def parse_resumes(texts: List[str], nlp, batch_size: int = 16) -> List[Dict[str, Any]]:
+    """Like parse_resume for many texts, running spaCy over them with nlp.pipe."""
+    parsed = [{} for _ in texts]
+    indexed = [(i, text) for i, text in enumerate(texts) if text]
+    with metrics.timer("parse_batch"):
+        docs = nlp.pipe((text for _, text in indexed), batch_size=batch_size)
+        for (i, text), doc in zip(indexed, docs):
+            parsed[i] = _parse_resume_doc(doc, text, nlp)
+    metrics.inc("documents_total", len(indexed), kind="parsed")
+    return parsed
+
+
+def _parse_resume_doc(doc, full_text: str, nlp) -> Dict[str, Any]:
     clean_text = re.sub(r'\s+', ' ', full_text).strip()
     return {
         "contact_info": _extract_contact_info(doc),
@@ -204,6 +224,7 @@ def parse_resume(full_text: str, nlp) -> Dict[str, Any]:
     }
 
 
+@metrics.timed("parse_jd")
 def parse_job_description(jd_text: str, nlp) -> Dict[str, Any]:
     if not jd_text:
         return {}
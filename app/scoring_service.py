@@ -0,0 +1,314 @@
+"""
+Local HTTP scoring service for calling screening from other systems (e.g. an ATS).
+
+    python -m app.scoring_service --port 8000 --max-batch 32 --max-latency-ms 5
+
+Endpoints (JSON in, JSON out):
+    POST /parse  {"text": "...", "kind": "resume" | "jd"}
+    POST /score  {"resume": <text or parsed>, "jd": <text or parsed>, "weights": {...}}
+    POST /rank   {"resumes": [{"filename": "...", "text": "..."} | parsed, ...], "jd": <text or parsed>}
+    GET  /health, GET /stats, GET /metrics (Prometheus text), GET /metrics.json
+
+The spaCy pipeline and embedder stay resident. Concurrent requests are micro-batched:
+encode and parse calls arriving within max-latency-ms of each other are coalesced into a
+single embedder.encode / nlp.pipe call of at most max-batch items. A request running alone
+is not held back by that window.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app import metrics
+
+class InFlight:
+    """
+    Counts requests in progress across threads; nested track() calls on one thread count once.
+    Calling it says whether more than one request is running, i.e. whether batching can pay off.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.active = 0
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if not depth:
+            with self._lock:
+                self.active += 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if not depth:
+                with self._lock:
+                    self.active -= 1
+
+    def __call__(self) -> bool:
+        return self.active > 1
+
+def check_text(value: Any, what: str = "text") -> str:
+    """Rejects non-string input before it is queued, so it can't fail a batch shared with other requests."""
+    if not isinstance(value, str):
+        raise ValueError(f"{what} must be a string, got {type(value).__name__}")
+    return value
+
+def parse_batch(items: List[tuple], nlp) -> List[Dict[str, Any]]:
+    """
+    Batch function for a parse MicroBatcher: items are ("resume" | "jd", text) pairs. Resumes
+    go through one nlp.pipe call; JDs are parsed one by one.
+    """
+    from app import resume_parser
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    resume_idx = [i for i, (kind, _) in enumerate(items) if kind == "resume"]
+    for i, parsed in zip(resume_idx, resume_parser.parse_resumes([items[i][1] for i in resume_idx], nlp)):
+        results[i] = parsed
+    for i, (kind, text) in enumerate(items):
+        if kind == "jd":
+            results[i] = resume_parser.parse_job_description(text, nlp)
+    return results
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads and runs batch_fn over them together.
+    A batch takes whatever is already queued; it then waits up to max_latency seconds after its
+    first item for more, but only while busy() says other requests are in flight (always, if no
+    busy callable is given), so a lone caller's serial calls aren't each delayed by the window.
+    batch_fn takes a list of items and returns a list of results in the same order. If it raises
+    on a batch of several items, they are retried one by one so one bad item only fails its caller.
+    """
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_latency: float = 0.005, name: str = "batcher", busy: Optional[Callable[[], bool]] = None):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.busy = busy
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "items": 0, "max_batch": 0, "batch_seconds": 0.0, "split_batches": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(item).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = dict(self._stats)
+        result["avg_batch"] = round(result["items"] / result["batches"], 2) if result["batches"] else 0.0
+        result["queue_depth"] = self._queue.qsize()
+        return result
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (self.busy is not None and not self.busy()):
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            start = time.perf_counter()
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                else:
+                    with self._lock:
+                        self._stats["split_batches"] += 1
+                    self._run_singly(batch)
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["items"] += len(batch)
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+                self._stats["batch_seconds"] += time.perf_counter() - start
+
+    def _run_singly(self, batch):
+        for item, future in batch:
+            try:
+                future.set_result(self.batch_fn([item])[0])
+            except Exception as e:
+                future.set_exception(e)
+
+class BatchingEmbedder:
+    """Embedder stand-in for matcher: each encode() call goes through a shared MicroBatcher."""
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+
+    def encode(self, sentences, **kwargs):
+        import numpy as np
+        single = isinstance(sentences, str)
+        texts = [check_text(t) for t in ([sentences] if single else sentences)]
+        futures = [self.batcher.submit(t) for t in texts]
+        vectors = [f.result() for f in futures]
+        return vectors[0] if single else np.stack(vectors)
+
+class ScoringService:
+    def __init__(self, nlp, embedder, max_batch_size: int = 32, max_latency: float = 0.005):
+        # Imported here rather than lazily so the first request doesn't pay for sklearn/numpy imports
+        from app import matcher, resume_parser
+        self.nlp = nlp
+        self.matcher = matcher
+        self.resume_parser = resume_parser
+        self.in_flight = InFlight()
+        self.encode_batcher = MicroBatcher(lambda texts: list(embedder.encode(texts)),
+                                           max_batch_size, max_latency, name="encode-batcher", busy=self.in_flight)
+        self.parse_batcher = MicroBatcher(lambda items: parse_batch(items, nlp), max_batch_size, max_latency,
+                                          name="parse-batcher", busy=self.in_flight)
+        self.embedder = BatchingEmbedder(self.encode_batcher)
+        self.started = time.time()
+
+    def parse(self, text: str, kind: str = "resume") -> Dict[str, Any]:
+        if kind not in ("resume", "jd"):
+            raise ValueError("kind must be 'resume' or 'jd'")
+        check_text(text)
+        with self.in_flight.track():
+            return self.parse_batcher((kind, text))
+
+    def _as_parsed(self, value, kind: str) -> Dict[str, Any]:
+        if isinstance(value, str):
+            return self.parse(value, kind)
+        if isinstance(value, dict) and "text" in value and "full_text" not in value:
+            parsed = self.parse(value["text"], kind)
+            if value.get("filename"):
+                parsed["filename"] = value["filename"]
+            return parsed
+        if isinstance(value, dict):
+            return value
+        raise ValueError(f"{kind} must be text or a parsed object")
+
+    def score(self, resume, jd, weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        with self.in_flight.track():
+            return self.matcher.calculate_score_breakdown(self._as_parsed(resume, "resume"),
+                                                          self._as_parsed(jd, "jd"), self.embedder, weights)
+
+    def rank(self, resumes: List[Any], jd) -> List[Dict[str, Any]]:
+        with self.in_flight.track():
+            return self._rank(resumes, jd)
+
+    def _rank(self, resumes: List[Any], jd) -> List[Dict[str, Any]]:
+        texts = [check_text(r["text"] if isinstance(r, dict) else r, "resume text")
+                 if isinstance(r, str) or (isinstance(r, dict) and "full_text" not in r) else None
+                 for r in resumes]
+        # Submit every resume parse at once so they share nlp.pipe batches
+        futures = [self.parse_batcher.submit(("resume", t)) if t is not None else None for t in texts]
+        parsed_resumes = []
+        for r, future in zip(resumes, futures):
+            parsed = future.result() if future else dict(r)
+            if isinstance(r, dict) and r.get("filename"):
+                parsed["filename"] = r["filename"]
+            parsed_resumes.append(parsed)
+        ranked = self.matcher.rank_resumes(parsed_resumes, self._as_parsed(jd, "jd"), self.embedder)
+        # full_text is the caller's own input; leave it out of the response
+        for entry in ranked:
+            entry["parsed_data"] = {k: v for k, v in entry["parsed_data"].items() if k != "full_text"}
+        return ranked
+
+    def stats(self) -> Dict[str, Any]:
+        return {"uptime_seconds": round(time.time() - self.started, 1),
+                "encode": self.encode_batcher.stats(), "parse": self.parse_batcher.stats()}
+
+def make_handler(service: ScoringService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, payload, content_type: str = "application/json"):
+            body = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send(200, service.stats())
+            elif self.path == "/metrics":
+                self._send(200, metrics.prometheus_text(), "text/plain; version=0.0.4")
+            elif self.path == "/metrics.json":
+                self._send(200, metrics.snapshot())
+            else:
+                self._send(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/parse":
+                    result = service.parse(payload["text"], payload.get("kind", "resume"))
+                elif self.path == "/score":
+                    result = service.score(payload["resume"], payload["jd"], payload.get("weights"))
+                elif self.path == "/rank":
+                    result = service.rank(payload["resumes"], payload["jd"])
+                else:
+                    self._send(404, {"error": f"unknown path {self.path}"})
+                    return
+                self._send(200, result)
+            except (KeyError, ValueError, TypeError) as e:
+                self._send(400, {"error": f"bad request: {e}"})
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load (1 s SYN retries)
+    request_queue_size = 128
+
+def serve(host: str = "127.0.0.1", port: int = 8000, max_batch_size: int = 32, max_latency_ms: float = 5.0,
+          service: Optional[ScoringService] = None) -> ScoringHTTPServer:
+    """Builds the server (loading models unless a service is passed); call serve_forever() on it."""
+    if service is None:
+        from app import models
+        nlp, embedder = models.load_models()
+        service = ScoringService(nlp, embedder, max_batch_size, max_latency_ms / 1000)
+    return ScoringHTTPServer((host, port), make_handler(service))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve parse/score/rank over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=32, help="Max items per encode/parse batch")
+    parser.add_argument("--max-latency-ms", type=float, default=5.0,
+                        help="How long a batch waits for more requests after its first")
+    args = parser.parse_args(argv)
+    server = serve(args.host, args.port, args.max_batch, args.max_latency_ms)
+    print(f"Scoring service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
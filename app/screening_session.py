@@ -0,0 +1,197 @@
+"""
+Incremental screening session: tracks the uploaded resume set by content hash so that
+changing the uploads only parses the new files, and re-ranking only scores candidates
+that have not been scored against the current JD and weights.
+
+With a BlobStore, upload bytes and each resume's full_text live on disk: the parsed dicts keep
+a "full_text_blob" handle instead, and the text is read back only while a resume is scored.
+If the store's garbage collector removed a long-idle session's blobs, the affected resumes are
+dropped so the next sync parses them again.
+"""
+import bisect
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app import matcher, metrics
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha1(bytes(content)).hexdigest()
+
+def _fingerprint(parsed_jd: Dict[str, Any], weights: Optional[Dict[str, float]]) -> str:
+    payload = json.dumps([parsed_jd, weights], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class _HydratedResumes(Sequence):
+    """Parsed resumes with full_text read back from the blob store one slice at a time."""
+    def __init__(self, resumes: List[Dict[str, Any]], hydrate: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.resumes = resumes
+        self.hydrate = hydrate
+
+    def __len__(self):
+        return len(self.resumes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.hydrate(data) for data in self.resumes[index]]
+        return self.hydrate(self.resumes[index])
+
+class ScreeningSession:
+    """
+    Holds parsed resumes keyed by content hash (in upload order) and a ranking kept sorted
+    by score. sync() diffs a new upload set against the session; rank() scores only what
+    the current ranking is missing, and rescores everything only when the JD or weights change.
+    """
+    def __init__(self, blobs=None):
+        self.blobs = blobs
+        self.parsed: Dict[str, Dict[str, Any]] = {}
+        self.failed: Dict[str, str] = {}      # hash -> filename of content with no extractable text
+        self.ranked: List[Dict[str, Any]] = []
+        self._sort_keys: List[float] = []     # -score for each entry in ranked, for bisect
+        self._ranked_hashes: Dict[str, Dict[str, Any]] = {}
+        self._fingerprint: Optional[str] = None
+        self.stats = {"parses": 0, "scorings": 0}
+
+    def sync(self, files: List[Tuple[str, bytes]], parse_fn: Callable[[str, bytes], Optional[Dict[str, Any]]]
+             ) -> Dict[str, List[str]]:
+        """
+        Brings the session in line with files, a list of (filename, content). parse_fn(filename, content)
+        returns the parsed resume or None if no text could be extracted; it is called for new content only.
+        Content that yields no text is remembered as failed; if parse_fn raises (model not ready, worker
+        unreachable, ...) the file is left out and parsed again on the next sync.
+        Returns the filenames that were added, removed, failed, skipped as duplicates, or hit errors
+        ("errors" holds (filename, exception) pairs).
+        """
+        changes = {"added": [], "removed": [], "failed": [], "duplicates": [], "errors": []}
+        self.drop_missing_blobs()
+        current: Dict[str, str] = {}
+        for filename, content in files:
+            digest = content_hash(content)
+            if digest in current:
+                changes["duplicates"].append(filename)
+                continue
+            current[digest] = filename
+            if digest in self.parsed or digest in self.failed:
+                metrics.inc("cache_hits_total", cache="parse")
+            else:
+                metrics.inc("cache_misses_total", cache="parse")
+            if digest in self.parsed:
+                # Same content re-uploaded under another name: keep the parse, update the name
+                self.parsed[digest]["filename"] = filename
+                if digest in self._ranked_hashes:
+                    self._ranked_hashes[digest]["filename"] = filename
+                continue
+            if digest in self.failed:
+                continue
+            try:
+                parsed = parse_fn(filename, content)
+            except Exception as e:
+                changes["errors"].append((filename, e))
+                continue
+            self.stats["parses"] += 1
+            if parsed:
+                parsed["filename"] = filename
+                if self.blobs is not None:
+                    self.blobs.put(content, digest)
+                    parsed["full_text_blob"] = self.blobs.put_text(parsed.pop("full_text", ""))
+                self.parsed[digest] = parsed
+                changes["added"].append(filename)
+            else:
+                self.failed[digest] = filename
+                changes["failed"].append(filename)
+
+        removed = [(d, self.parsed.pop(d)) for d in list(self.parsed) if d not in current]
+        for digest, data in removed:
+            changes["removed"].append(data["filename"])
+            self._unrank(digest)
+        for digest in [d for d in self.failed if d not in current]:
+            del self.failed[digest]
+        if self.blobs is not None and removed:
+            # A text blob can be shared by two uploads that extract to the same text
+            in_use = set(self.parsed) | {data.get("full_text_blob") for data in self.parsed.values()}
+            for digest, data in removed:
+                for handle in (digest, data.get("full_text_blob")):
+                    if handle and handle not in in_use:
+                        self.blobs.delete(handle)
+        return changes
+
+    def drop_missing_blobs(self) -> int:
+        """
+        Forgets parsed resumes whose full_text blob is gone (collected after a long idle), so a
+        sync parses their uploads again instead of rank() failing. Returns how many were dropped.
+        """
+        if self.blobs is None:
+            return 0
+        self.blobs.touch(force=True)   # also keeps the collector off this session for the next TTL
+        missing = [d for d, data in self.parsed.items()
+                   if "full_text_blob" in data and not self.blobs.exists(data["full_text_blob"])]
+        for digest in missing:
+            del self.parsed[digest]
+            self._unrank(digest)
+        return len(missing)
+
+    def _unrank(self, digest: str):
+        entry = self._ranked_hashes.pop(digest, None)
+        if entry is not None:
+            index = next(i for i, e in enumerate(self.ranked) if e is entry)
+            del self.ranked[index], self._sort_keys[index]
+
+    def _hydrate(self, data: Dict[str, Any], missing_ok: bool = False) -> Dict[str, Any]:
+        if "full_text_blob" not in data:
+            return data
+        hydrated = dict(data)
+        handle = hydrated.pop("full_text_blob")
+        try:
+            hydrated["full_text"] = self.blobs.get_text(handle)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+        return hydrated
+
+    def with_full_text(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Ranked entries with full_text restored in parsed_data, e.g. for storage.save_results.
+        An entry whose text blob has been collected is returned without full_text (so it is
+        saved but not archived) rather than failing the save.
+        """
+        return [dict(e, parsed_data=self._hydrate(e["parsed_data"], missing_ok=True)) for e in entries]
+
+    def parsed_resumes(self) -> List[Dict[str, Any]]:
+        return list(self.parsed.values())
+
+    def iter_rank(self, parsed_jd: Dict[str, Any], embedder, weights: Optional[Dict[str, float]] = None,
+                  chunk_size: int = 25, top_k: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Like matcher.iter_rank_resumes over the candidates still to be scored, but each progress
+        dict's "top" is the head of the whole session ranking. Candidates scored before the caller
+        stops iterating stay ranked, so a cancelled run resumes where it left off.
+        """
+        self.drop_missing_blobs()
+        fingerprint = _fingerprint(parsed_jd, weights)
+        if fingerprint != self._fingerprint:
+            self.ranked, self._sort_keys, self._ranked_hashes = [], [], {}
+            self._fingerprint = fingerprint
+        pending = [(digest, data) for digest, data in self.parsed.items() if digest not in self._ranked_hashes]
+        offset = 0
+        resumes = _HydratedResumes([data for _, data in pending], self._hydrate)
+        for progress in matcher.iter_rank_resumes(resumes, parsed_jd, embedder,
+                                                  chunk_size, top_k=0, weights=weights):
+            for (digest, data), entry in zip(pending[offset:], progress["entries"]):
+                # Keep the slim dict in the ranking, not the one with full_text read back in
+                entry["parsed_data"] = data
+                self.stats["scorings"] += 1
+                # Highest score first; ties keep insertion order like sorted() in rank_resumes
+                index = bisect.bisect_right(self._sort_keys, -entry["score"])
+                self._sort_keys.insert(index, -entry["score"])
+                self.ranked.insert(index, entry)
+                self._ranked_hashes[digest] = entry
+            offset = progress["scored"]
+            progress["top"] = self.ranked[:top_k]
+            yield progress
+
+    def rank(self, parsed_jd: Dict[str, Any], embedder, weights: Optional[Dict[str, float]] = None
+             ) -> List[Dict[str, Any]]:
+        for _ in self.iter_rank(parsed_jd, embedder, weights):
+            pass
+        return list(self.ranked)
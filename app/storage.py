@@ -1,9 +1,21 @@
 import sqlite3
 import os
+import atexit
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
-DB_PATH = "resume_screening.db"
+from app import metrics
+
+# RESUME_DB_PATH lets job workers on several hosts share one database file on a shared volume
+DB_PATH = os.getenv("RESUME_DB_PATH", "resume_screening.db")
+
+# Per-component scores stored alongside the final score (see matcher.SCORE_COMPONENTS)
+SCORE_COLUMNS = ["skills_score", "experience_score", "education_score", "overall_text_score"]
 
 def init_db():
     conn = sqlite3.connect(DB_PATH)
@@ -21,25 +33,144 @@ def init_db():
             session_id INTEGER NOT NULL,
             filename TEXT NOT NULL,
             score REAL NOT NULL,
+            skills_score REAL,
+            experience_score REAL,
+            education_score REAL,
+            overall_text_score REAL,
             FOREIGN KEY (session_id) REFERENCES screening_sessions(id) ON DELETE CASCADE
         )
     ''')
+    # Databases created before component scores were stored get the columns added
+    existing = {row[1] for row in cursor.execute('PRAGMA table_info(screening_results)')}
+    for column in SCORE_COLUMNS:
+        if column not in existing:
+            cursor.execute(f'ALTER TABLE screening_results ADD COLUMN {column} REAL')
     # Add indexes for speed
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_session ON screening_results (session_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON screening_sessions (timestamp)')
+    # Lets per-session exports stream rows already in score order
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_score ON screening_results (session_id, score DESC)')
+    _init_candidate_archive(cursor)
     conn.commit()
     conn.close()
 
+def _init_candidate_archive(cursor):
+    """Candidate archive: one row per distinct resume text, indexed by an external-content FTS5 table."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            filename TEXT NOT NULL,
+            name TEXT,
+            email TEXT,
+            phone TEXT,
+            skills TEXT,
+            total_experience_years REAL NOT NULL DEFAULT 0,
+            full_text TEXT NOT NULL,
+            content_hash TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_session ON candidates (session_id)')
+    # Every session that saw a candidate; candidates.session_id only records the earliest one still stored
+    has_links = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidate_sessions'").fetchone()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS candidate_sessions (
+            candidate_id INTEGER NOT NULL,
+            session_id INTEGER NOT NULL,
+            PRIMARY KEY (candidate_id, session_id),
+            FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE,
+            FOREIGN KEY (session_id) REFERENCES screening_sessions(id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_sessions_session ON candidate_sessions (session_id)')
+    if not has_links:
+        # Archives created before the link table get each candidate's first session linked
+        cursor.execute('INSERT INTO candidate_sessions (candidate_id, session_id) SELECT id, session_id FROM candidates')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_experience ON candidates (total_experience_years)')
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                name, skills, full_text,
+                content='candidates', content_rowid='id', tokenize='porter unicode61'
+            )
+        ''')
+        # Keep the FTS index in step with the content table
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts (rowid, name, skills, full_text)
+                VALUES (new.id, new.name, new.skills, new.full_text);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN
+                INSERT INTO candidates_fts (candidates_fts, rowid, name, skills, full_text)
+                VALUES ('delete', old.id, old.name, old.skills, old.full_text);
+            END
+        ''')
+        # ORDER BY rank uses BM25 with name and skills hits weighted above body text
+        cursor.execute("INSERT INTO candidates_fts (candidates_fts, rank) VALUES ('rank', 'bm25(2.0, 4.0, 1.0)')")
+    except sqlite3.OperationalError as e:
+        print(f"[DB ERROR] FTS5 unavailable, candidate search disabled: {e}")
+
+def _now_timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _insert_session(cursor, ranked_resumes: List[Dict[str, Any]], job_title: str, timestamp: str) -> int:
+    cursor.execute('INSERT INTO screening_sessions (job_title, timestamp) VALUES (?, ?)', (job_title, timestamp))
+    session_id = cursor.lastrowid
+    _insert_results(cursor, session_id, ranked_resumes)
+    return session_id
+
+def _insert_results(cursor, session_id: int, ranked_resumes: List[Dict[str, Any]]):
+    metrics.inc("db_rows_written_total", len(ranked_resumes))
+    resume_data = [
+        (session_id, e.get("filename", "Unknown"), e.get("score", 0.0))
+        + tuple(e.get("score_breakdown", {}).get(c[:-len("_score")]) for c in SCORE_COLUMNS)
+        for e in ranked_resumes
+    ]
+    cursor.executemany(
+        f'INSERT INTO screening_results (session_id, filename, score, {", ".join(SCORE_COLUMNS)}) '
+        f'VALUES (?, ?, ?, {", ".join("?" * len(SCORE_COLUMNS))})',
+        resume_data
+    )
+    candidate_data = [_candidate_row(session_id, e) for e in ranked_resumes if e.get("parsed_data", {}).get("full_text")]
+    if candidate_data:
+        # Resumes already archived (same text) keep their original row and just gain a session link
+        cursor.executemany('''
+            INSERT OR IGNORE INTO candidates
+                (session_id, filename, name, email, phone, skills, total_experience_years, full_text, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', candidate_data)
+        cursor.executemany('''
+            INSERT OR IGNORE INTO candidate_sessions (candidate_id, session_id)
+            SELECT id, ? FROM candidates WHERE content_hash = ?
+        ''', [(session_id, row[-1]) for row in candidate_data])
+
+def _candidate_row(session_id: int, entry: Dict[str, Any]) -> tuple:
+    data = entry.get("parsed_data", {})
+    contact = data.get("contact_info", {})
+    full_text = data.get("full_text", "")
+    return (
+        session_id,
+        entry.get("filename", "Unknown"),
+        contact.get("name", ""),
+        contact.get("email", ""),
+        contact.get("phone", ""),
+        ", ".join(data.get("skills", [])),
+        float(data.get("total_experience_years", 0.0) or 0.0),
+        full_text,
+        hashlib.sha1(full_text.encode("utf-8")).hexdigest(),
+    )
+
 def save_results(ranked_resumes: List[Dict[str, Any]], job_title: str) -> Optional[int]:
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     try:
-        cursor.execute('INSERT INTO screening_sessions (job_title, timestamp) VALUES (?, ?)', (job_title, timestamp))
-        session_id = cursor.lastrowid
-        resume_data = [(session_id, e.get("filename", "Unknown"), e.get("score", 0.0)) for e in ranked_resumes]
-        cursor.executemany('INSERT INTO screening_results (session_id, filename, score) VALUES (?, ?, ?)', resume_data)
-        conn.commit()
+        # Timed through the commit: the fsync is most of the cost of a write
+        with metrics.timer("db_write"):
+            session_id = _insert_session(cursor, ranked_resumes, job_title, _now_timestamp())
+            conn.commit()
         return session_id
     except sqlite3.Error as e:
         print(f"[DB ERROR] Saving results failed: {e}")
@@ -48,6 +179,221 @@ def save_results(ranked_resumes: List[Dict[str, Any]], job_title: str) -> Option
     finally:
         conn.close()
 
+# --- Incremental sessions for batch runs ---
+
+def create_session(job_title: str) -> Optional[int]:
+    """Creates an empty screening session that results are appended to with append_results."""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.execute('INSERT INTO screening_sessions (job_title, timestamp) VALUES (?, ?)',
+                              (job_title, _now_timestamp()))
+        conn.commit()
+        return cursor.lastrowid
+    except sqlite3.Error as e:
+        print(f"[DB ERROR] Creating session failed: {e}")
+        return None
+    finally:
+        conn.close()
+
+def append_results(results_by_session: Dict[int, List[Dict[str, Any]]]) -> bool:
+    """Appends results to existing sessions, all in one transaction."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        with metrics.timer("db_write"):
+            for session_id, ranked_resumes in results_by_session.items():
+                _insert_results(cursor, session_id, ranked_resumes)
+            conn.commit()
+        return True
+    except sqlite3.Error as e:
+        print(f"[DB ERROR] Appending results failed: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+# --- Write-behind mode for save_results ---
+
+_FLUSH = object()
+_STOP = object()
+
+class WriteBehindWriter:
+    """
+    Background writer that batches queued save_results calls into a single transaction.
+    submit() returns a Future resolved with the session_id once the batch is committed
+    (or None if the insert failed). A full queue blocks callers, which is the back-pressure.
+    """
+    def __init__(self, db_path: Optional[str] = None, max_queue: int = 256, max_batch: int = 64):
+        self.db_path = db_path or DB_PATH
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"batches": 0, "sessions_written": 0, "failed": 0,
+                       "last_flush_ms": 0.0, "max_flush_ms": 0.0, "total_flush_ms": 0.0}
+        self._thread = threading.Thread(target=self._run, name="storage-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, ranked_resumes: List[Dict[str, Any]], job_title: str,
+               timeout: Optional[float] = None) -> Future:
+        if self._closed:
+            raise RuntimeError("Write-behind writer is closed.")
+        future = Future()
+        # Snapshot rows now so later mutation of ranked_resumes by the caller can't leak into the write
+        rows = [{"filename": e.get("filename", "Unknown"), "score": e.get("score", 0.0),
+                 "score_breakdown": e.get("score_breakdown", {}), "parsed_data": e.get("parsed_data", {})}
+                for e in ranked_resumes]
+        self._queue.put((rows, job_title, _now_timestamp(), future), timeout=timeout)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is committed."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        marker = Future()
+        self._queue.put((_FLUSH, marker), timeout=timeout)
+        try:
+            marker.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: Optional[float] = None):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None))
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = dict(self._stats)
+        result["queue_depth"] = self._queue.qsize()
+        result["avg_flush_ms"] = round(result["total_flush_ms"] / result["batches"], 3) if result["batches"] else 0.0
+        result["total_flush_ms"] = round(result["total_flush_ms"], 3)
+        return result
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                # Coalesce whatever else is already waiting, up to max_batch writes
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                writes = [item for item in batch if item[0] is not _FLUSH and item[0] is not _STOP]
+                if writes:
+                    try:
+                        self._write_batch(conn, writes)
+                    except Exception as e:
+                        # Never let one batch kill the writer: pending futures would never resolve
+                        print(f"[DB ERROR] Write-behind batch failed: {e}")
+                        for w in writes:
+                            if not w[3].done():
+                                w[3].set_exception(e)
+                for item in batch:
+                    if item[0] is _FLUSH:
+                        item[1].set_result(True)
+                    elif item[0] is _STOP:
+                        stopping = True
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, writes):
+        start = time.perf_counter()
+        cursor = conn.cursor()
+        try:
+            with metrics.timer("db_write"):
+                session_ids = [self._insert(cursor, w) for w in writes]
+                conn.commit()
+            results = [(w, session_id, None) for w, session_id in zip(writes, session_ids)]
+        except Exception as e:
+            print(f"[DB ERROR] Write-behind batch of {len(writes)} failed, retrying individually: {e}")
+            conn.rollback()
+            results = []
+            for w in writes:
+                try:
+                    with metrics.timer("db_write"):
+                        session_id = self._insert(cursor, w)
+                        conn.commit()
+                    results.append((w, session_id, None))
+                except sqlite3.Error as e:
+                    print(f"[DB ERROR] Saving results failed: {e}")
+                    conn.rollback()
+                    results.append((w, None, None))
+                except Exception as e:
+                    # Bad data rather than a DB failure: hand the error to the caller and keep the writer alive
+                    print(f"[DB ERROR] Saving results failed: {e}")
+                    conn.rollback()
+                    results.append((w, None, e))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["sessions_written"] += sum(1 for _, sid, _ in results if sid is not None)
+            self._stats["failed"] += sum(1 for _, sid, _ in results if sid is None)
+            self._stats["last_flush_ms"] = round(elapsed_ms, 3)
+            self._stats["max_flush_ms"] = round(max(self._stats["max_flush_ms"], elapsed_ms), 3)
+            self._stats["total_flush_ms"] += elapsed_ms
+        for w, session_id, error in results:
+            if error is not None:
+                w[3].set_exception(error)
+            else:
+                w[3].set_result(session_id)
+
+    @staticmethod
+    def _insert(cursor, write) -> int:
+        rows, job_title, timestamp, _ = write
+        return _insert_session(cursor, rows, job_title, timestamp)
+
+_writer: Optional[WriteBehindWriter] = None
+_writer_lock = threading.Lock()
+
+def enable_write_behind(max_queue: int = 256, max_batch: int = 64) -> WriteBehindWriter:
+    """Start the process-wide background writer (idempotent)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindWriter(max_queue=max_queue, max_batch=max_batch)
+        return _writer
+
+def disable_write_behind(timeout: Optional[float] = None):
+    """Flush pending writes and stop the background writer."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+def save_results_async(ranked_resumes: List[Dict[str, Any]], job_title: str,
+                       timeout: Optional[float] = None) -> Future:
+    """
+    Queue results for the background writer. Returns a Future resolving to the session_id.
+    Falls back to a synchronous save (already-resolved Future) when write-behind is off.
+    """
+    writer = _writer
+    if writer is not None:
+        return writer.submit(ranked_resumes, job_title, timeout=timeout)
+    future = Future()
+    try:
+        future.set_result(save_results(ranked_resumes, job_title))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def flush_writes(timeout: Optional[float] = None) -> bool:
+    writer = _writer
+    return writer.flush(timeout) if writer is not None else True
+
+def write_behind_stats() -> Dict[str, Any]:
+    writer = _writer
+    return writer.stats() if writer is not None else {}
+
+atexit.register(disable_write_behind)
+
 def fetch_results(limit: int = 100) -> List[Dict[str, Any]]:
     if not os.path.exists(DB_PATH): return []
     conn = sqlite3.connect(DB_PATH)
@@ -67,6 +413,26 @@ def fetch_results(limit: int = 100) -> List[Dict[str, Any]]:
     finally:
         conn.close()
 
+def fetch_sessions() -> List[Dict[str, Any]]:
+    """Every screening session, newest first, with its result count (for pickers; no result rows)."""
+    if not os.path.exists(DB_PATH): return []
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            SELECT ss.id AS session_id, ss.job_title, ss.timestamp,
+                   (SELECT COUNT(*) FROM screening_results sr WHERE sr.session_id = ss.id) AS results
+            FROM screening_sessions ss
+            ORDER BY ss.id DESC
+        ''')
+        columns = [desc[0] for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"[DB ERROR] Fetching sessions failed: {e}")
+        return []
+    finally:
+        conn.close()
+
 def fetch_session_results(session_id: int) -> List[Dict[str, Any]]:
     if not os.path.exists(DB_PATH): return []
     conn = sqlite3.connect(DB_PATH)
@@ -84,11 +450,121 @@ def fetch_session_results(session_id: int) -> List[Dict[str, Any]]:
     finally:
         conn.close()
 
+def _quote_fts_terms(query: str) -> str:
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+def search_candidates(query: str, min_experience: Optional[float] = None,
+                      max_experience: Optional[float] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Full-text search over every archived candidate, best BM25 match first.
+    query uses FTS5 syntax, e.g. 'kubernetes AND golang' or '"machine learning" OR pytorch';
+    if it doesn't parse, its words are matched literally instead.
+    """
+    if not query or not query.strip() or not os.path.exists(DB_PATH): return []
+    sql = '''
+        SELECT c.id AS candidate_id, c.session_id, c.filename, c.name, c.email, c.phone, c.skills,
+               c.total_experience_years, snippet(candidates_fts, 2, '[', ']', '...', 12) AS snippet,
+               rank AS relevance
+        FROM candidates_fts
+        JOIN candidates c ON c.id = candidates_fts.rowid
+        WHERE candidates_fts MATCH ?
+    '''
+    params: List[Any] = []
+    if min_experience is not None:
+        sql += " AND c.total_experience_years >= ?"
+        params.append(min_experience)
+    if max_experience is not None:
+        sql += " AND c.total_experience_years <= ?"
+        params.append(max_experience)
+    sql += " ORDER BY rank LIMIT ?"
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        for match in (query, _quote_fts_terms(query)):
+            try:
+                cursor.execute(sql, [match] + params + [limit])
+                break
+            except sqlite3.OperationalError as e:
+                if match != query or "syntax error" not in str(e) and "no such column" not in str(e):
+                    raise
+        columns = [desc[0] for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"[DB ERROR] Candidate search failed: {e}")
+        return []
+    finally:
+        conn.close()
+
+def iter_results(session_id: Optional[int] = None, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None, job_title: Optional[str] = None,
+                 chunk_size: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields stored results in chunks of at most chunk_size dicts, straight off the cursor,
+    so callers never hold the full result set. Dates are inclusive 'YYYY-MM-DD';
+    job_title is a case-insensitive substring match. Raises sqlite3.Error if the query fails.
+    """
+    if not os.path.exists(DB_PATH): return
+    sql = f'''
+        SELECT ss.id AS session_id, ss.job_title, ss.timestamp, sr.filename, sr.score,
+               {", ".join("sr." + c for c in SCORE_COLUMNS)}
+        FROM screening_results sr
+        JOIN screening_sessions ss ON sr.session_id = ss.id
+        WHERE 1 = 1
+    '''
+    params: List[Any] = []
+    if session_id is not None:
+        sql += " AND ss.id = ?"
+        params.append(session_id)
+    if start_date:
+        sql += " AND date(ss.timestamp) >= ?"
+        params.append(start_date)
+    if end_date:
+        sql += " AND date(ss.timestamp) <= ?"
+        params.append(end_date)
+    if job_title:
+        sql += " AND ss.job_title LIKE ?"
+        params.append(f"%{job_title}%")
+    sql += " ORDER BY ss.id, sr.score DESC"
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        columns = [desc[0] for desc in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(zip(columns, row)) for row in rows]
+    except sqlite3.Error as e:
+        # Re-raised so a consumer mid-export doesn't mistake a truncated stream for the full result set
+        print(f"[DB ERROR] Iterating results failed: {e}")
+        raise
+    finally:
+        conn.close()
+
 # --- New: Robust Deletion Functions ---
 
+def _delete_session(cursor, session_id: int):
+    """Deletes a session, its results, and the archived candidates no other session references."""
+    cursor.execute("SELECT candidate_id FROM candidate_sessions WHERE session_id = ?", (session_id,))
+    candidate_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("DELETE FROM candidate_sessions WHERE session_id = ?", (session_id,))
+    # The candidates_ad trigger removes each deleted candidate's FTS row
+    cursor.executemany('''
+        DELETE FROM candidates WHERE id = ?
+        AND NOT EXISTS (SELECT 1 FROM candidate_sessions WHERE candidate_id = ?)
+    ''', [(cid, cid) for cid in candidate_ids])
+    # Survivors first seen in this session point at the earliest session still holding them
+    cursor.executemany('''
+        UPDATE candidates SET session_id = (SELECT MIN(session_id) FROM candidate_sessions WHERE candidate_id = ?)
+        WHERE id = ? AND session_id = ?
+    ''', [(cid, cid, session_id) for cid in candidate_ids])
+    cursor.execute("DELETE FROM screening_results WHERE session_id = ?", (session_id,))
+    cursor.execute("DELETE FROM screening_sessions WHERE id = ?", (session_id,))
+
 def delete_results_by_date_range(start_date: str, end_date: str) -> int:
     """
-    Deletes all screening sessions and their results between start_date and end_date (inclusive).
+    Deletes all screening sessions, their results and archived candidates between start_date and end_date (inclusive).
     Both start_date and end_date should be 'YYYY-MM-DD' format.
     Returns the number of deleted sessions.
     """
@@ -105,8 +581,7 @@ def delete_results_by_date_range(start_date: str, end_date: str) -> int:
         session_ids = [row[0] for row in sessions]
         count = 0
         for sid in session_ids:
-            cursor.execute("DELETE FROM screening_results WHERE session_id = ?", (sid,))
-            cursor.execute("DELETE FROM screening_sessions WHERE id = ?", (sid,))
+            _delete_session(cursor, sid)
             count += 1
         conn.commit()
         return count
@@ -119,14 +594,13 @@ def delete_results_by_date_range(start_date: str, end_date: str) -> int:
 
 def delete_result_by_session_id(session_id: int) -> bool:
     """
-    Deletes a specific screening session and its results, given its session_id.
+    Deletes a specific screening session, its results and archived candidates, given its session_id.
     """
     if not os.path.exists(DB_PATH): return False
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     try:
-        cursor.execute("DELETE FROM screening_results WHERE session_id = ?", (session_id,))
-        cursor.execute("DELETE FROM screening_sessions WHERE id = ?", (session_id,))
+        _delete_session(cursor, session_id)
         conn.commit()
         return True
     except sqlite3.Error as e:
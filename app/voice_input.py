@@ -1,39 +1,236 @@
-import sounddevice as sd
-import soundfile as sf
-import speech_recognition as sr
-import tempfile
-import os
-from typing import Optional
-
-def get_jd_from_voice(duration: int = 15) -> Optional[str]:
-    recognizer = sr.Recognizer()
-    fs = 44100
-    print(f"Recording for {duration} seconds...")
+import numpy as np
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+TARGET_RATE = 16000          # speech recognizers want 16 kHz mono
+FRAME_MS = 30                # VAD frame length
+CALIBRATION_MS = 300         # initial audio used to estimate the noise floor
+SILENCE_TIMEOUT = 1.5        # stop after this much silence once speech has started
+NO_SPEECH_TIMEOUT = 5.0      # give up if nobody speaks at all
+CHUNK_PAUSE = 0.5            # a pause this long closes a chunk for background transcription
+MAX_CHUNK_SECONDS = 10.0
+
+# --- Recognizer backends: callables taking (pcm16 bytes, sample_rate) and returning text ---
+
+class GoogleRecognizer:
+    """Google Web Speech API via SpeechRecognition, fed from memory (no temp WAV)."""
+    def __init__(self):
+        import speech_recognition as sr
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+    def __call__(self, pcm: bytes, sample_rate: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self._recognizer.recognize_google(audio)
+        except self._sr.UnknownValueError:
+            return ""
+
+class SphinxRecognizer(GoogleRecognizer):
+    """Offline CMU Sphinx recognizer (requires pocketsphinx)."""
+    def __call__(self, pcm: bytes, sample_rate: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self._recognizer.recognize_sphinx(audio)
+        except self._sr.UnknownValueError:
+            return ""
+
+class StubRecognizer:
+    """Returns canned transcripts in order (or calls fn); for tests and demos without a speech service."""
+    def __init__(self, transcripts: Optional[List[str]] = None, fn: Optional[Callable[[bytes, int], str]] = None):
+        self.transcripts = list(transcripts or [])
+        self.fn = fn
+        self.calls = 0
+    def __call__(self, pcm: bytes, sample_rate: int) -> str:
+        self.calls += 1
+        if self.fn:
+            return self.fn(pcm, sample_rate)
+        return self.transcripts.pop(0) if self.transcripts else ""
+
+RECOGNIZERS = {"google": GoogleRecognizer, "sphinx": SphinxRecognizer}
+
+# --- Audio helpers ---
+
+def to_mono_int16(block: np.ndarray) -> np.ndarray:
+    block = np.asarray(block)
+    if block.ndim > 1:
+        block = block.mean(axis=1)
+    if block.dtype.kind == "f":
+        block = np.clip(block, -1.0, 1.0) * 32767
+    return block.astype(np.int16)
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int = TARGET_RATE) -> np.ndarray:
+    """Downsamples int16 audio; a box filter over each output period stands in for anti-aliasing."""
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples.astype(np.int16)
+    ratio = src_rate / dst_rate
+    n_out = int(len(samples) / ratio)
+    if ratio > 1:
+        width = int(round(ratio))
+        samples = np.convolve(samples.astype(np.float32), np.ones(width) / width, mode="same")
+    positions = np.arange(n_out) * ratio
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+def frame_rms(frame: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(frame.astype(np.float32) ** 2))) if len(frame) else 0.0
+
+def microphone_blocks(sample_rate: Optional[int] = None, block_ms: int = FRAME_MS,
+                      max_seconds: Optional[float] = None) -> Iterator[np.ndarray]:
+    """
+    Yields int16 mono blocks from the default input device; closing the generator stops the stream.
+    With max_seconds, also stops once that much wall-clock time has passed, so a device that
+    delivers no audio at all can't stall the caller.
+    """
+    import sounddevice as sd
+    if sample_rate is None:
+        sample_rate = int(sd.query_devices(kind="input")["default_samplerate"])
+    blocks = queue.Queue()
+
+    def on_audio(indata, frames, time_info, status):
+        blocks.put(indata.copy())
+
+    with sd.InputStream(samplerate=sample_rate, channels=1, dtype="int16",
+                        blocksize=int(sample_rate * block_ms / 1000), callback=on_audio):
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        while True:
+            try:
+                yield to_mono_int16(blocks.get(timeout=0.5))
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    print("Audio record error: no audio from the input device.")
+                    return
+
+# --- Streaming pipeline ---
+
+class StreamingTranscriber:
+    """
+    Consumes audio blocks, downsamples to 16 kHz, and uses frame-energy voice-activity
+    detection to cut the speech into chunks at short pauses. Each finished chunk is
+    transcribed on a background thread while capture continues; capture ends after
+    SILENCE_TIMEOUT of silence, so time-to-text follows the speech, not a fixed window.
+    """
+    def __init__(self, recognizer: Callable[[bytes, int], str], max_duration: float = 15.0,
+                 silence_timeout: float = SILENCE_TIMEOUT, no_speech_timeout: float = NO_SPEECH_TIMEOUT,
+                 energy_factor: float = 3.0, min_energy: float = 300.0):
+        self.recognizer = recognizer
+        self.max_duration = max_duration
+        self.silence_timeout = silence_timeout
+        self.no_speech_timeout = no_speech_timeout
+        self.energy_factor = energy_factor
+        self.min_energy = min_energy
+        self.stats = {"audio_seconds": 0.0, "speech_seconds": 0.0, "chunks": 0}
+        self._jobs = queue.Queue()
+        self._texts: List[str] = []
+        self._errors: List[Exception] = []
+        self._worker = threading.Thread(target=self._transcribe_worker, name="voice-transcriber", daemon=True)
+
+    def run(self, blocks: Iterable[np.ndarray], sample_rate: int) -> str:
+        self._worker.start()
+        try:
+            self._capture(blocks, sample_rate)
+        finally:
+            self._jobs.put(None)
+            self._worker.join()
+        if self._errors and not self._texts:
+            raise self._errors[0]
+        return " ".join(t for t in self._texts if t).strip()
+
+    def _capture(self, blocks, sample_rate):
+        frame_len = TARGET_RATE * FRAME_MS // 1000
+        pending = np.zeros(0, dtype=np.int16)
+        chunk: List[np.ndarray] = []
+        calibration: List[float] = []
+        threshold = None
+        speech_started = False
+        silent_frames = 0
+        total_frames = 0
+        frames_per_second = 1000 / FRAME_MS
+        for block in blocks:
+            pending = np.concatenate([pending, resample(to_mono_int16(block), sample_rate)])
+            while len(pending) >= frame_len:
+                frame, pending = pending[:frame_len], pending[frame_len:]
+                total_frames += 1
+                energy = frame_rms(frame)
+                if threshold is None:
+                    # Calibrate the noise floor before deciding what counts as speech
+                    calibration.append(energy)
+                    if len(calibration) * FRAME_MS >= CALIBRATION_MS:
+                        threshold = max(float(np.median(calibration)) * self.energy_factor, self.min_energy)
+                    continue
+                if energy >= threshold:
+                    speech_started = True
+                    silent_frames = 0
+                elif speech_started:
+                    silent_frames += 1
+                if speech_started:
+                    chunk.append(frame)
+                    pause = silent_frames / frames_per_second
+                    if pause >= CHUNK_PAUSE or len(chunk) / frames_per_second >= MAX_CHUNK_SECONDS:
+                        self._submit(chunk)
+                        chunk = []
+                    if pause >= self.silence_timeout:
+                        self._finish_stats(total_frames)
+                        return
+                elif total_frames / frames_per_second >= self.no_speech_timeout:
+                    self._finish_stats(total_frames)
+                    return
+                if total_frames / frames_per_second >= self.max_duration:
+                    self._submit(chunk)
+                    self._finish_stats(total_frames)
+                    return
+        self._submit(chunk)
+        self._finish_stats(total_frames)
+
+    def _submit(self, chunk):
+        # Chunks that are only trailing silence carry nothing to transcribe
+        voiced = [f for f in chunk if frame_rms(f) >= self.min_energy]
+        if not voiced:
+            return
+        self.stats["chunks"] += 1
+        self.stats["speech_seconds"] += len(chunk) * FRAME_MS / 1000
+        self._jobs.put(np.concatenate(chunk).tobytes())
+
+    def _finish_stats(self, total_frames):
+        self.stats["audio_seconds"] = round(total_frames * FRAME_MS / 1000, 2)
+
+    def _transcribe_worker(self):
+        while True:
+            pcm = self._jobs.get()
+            if pcm is None:
+                return
+            try:
+                self._texts.append(self.recognizer(pcm, TARGET_RATE))
+            except Exception as e:
+                self._errors.append(e)
+
+def transcribe_blocks(blocks: Iterable[np.ndarray], sample_rate: int,
+                      recognizer: Callable[[bytes, int], str], max_duration: float = 15.0) -> str:
+    """Runs the streaming pipeline over any block source (a microphone, a file, synthetic test audio)."""
+    return StreamingTranscriber(recognizer, max_duration=max_duration).run(blocks, sample_rate)
+
+def get_jd_from_voice(duration: int = 15, recognizer: Optional[Callable[[bytes, int], str]] = None,
+                      backend: str = "google") -> Optional[str]:
+    """Records until the speaker stops (at most `duration` seconds) and returns the transcript."""
     try:
-        audio_data = sd.rec(int(duration * fs), samplerate=fs, channels=1)
-        sd.wait()
+        recognizer = recognizer or RECOGNIZERS[backend]()
+        import sounddevice as sd
+        sample_rate = int(sd.query_devices(kind="input")["default_samplerate"])
     except Exception as e:
         print(f"Audio record error: {e}")
         return None
-    tmp_path = None
+    print(f"Listening for up to {duration} seconds...")
+    start = time.perf_counter()
+    mic = microphone_blocks(sample_rate, max_seconds=duration)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            sf.write(tmp_file.name, audio_data, fs)
-            tmp_path = tmp_file.name
-        with sr.AudioFile(tmp_path) as source:
-            audio = recognizer.record(source)
-            transcribed_text = recognizer.recognize_google(audio)
-            print("Transcription successful.")
-            return transcribed_text
-    except sr.UnknownValueError:
-        print("Audio not understood.")
-        return None
-    except sr.RequestError as e:
-        print(f"Google Speech Recognition error: {e}")
-        return None
+        text = transcribe_blocks(mic, sample_rate, recognizer, max_duration=duration)
     except Exception as e:
         print(f"Transcription error: {e}")
         return None
     finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+        mic.close()
+    if not text:
+        print("Audio not understood.")
+        return None
+    print(f"Transcription successful in {time.perf_counter() - start:.1f}s.")
+    return text
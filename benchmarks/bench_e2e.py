@@ -0,0 +1,245 @@
+"""
+End-to-end screening benchmark on a synthetic corpus: extraction -> parse_resume -> rank_resumes ->
+save_results, streamed a chunk at a time as in sustained ingestion (one saved session per chunk),
+then the merged final ranking and PDF export, with a stub embedder so results don't depend on model download or hardware acceleration.
+
+    python benchmarks/bench_e2e.py [--count 300] [--pages 1-3] [--formats pdf,docx,txt] [--chunk-size 256]
+    python benchmarks/bench_e2e.py --write-baseline        # refresh benchmarks/baseline_e2e.json
+    python benchmarks/bench_e2e.py --fail-on-regression    # exit 1 if slower than the baseline
+
+Reports per-stage throughput, per-item latency percentiles for extract/parse/rank (from the
+app.metrics stage histograms, so bucket-interpolated) and peak RSS, and compares them with the
+baseline when the configuration matches. The corpus is generated once per configuration and reused.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import synthetic_corpus
+from app import file_utils, matcher, metrics, pdf_exporter, resume_parser, storage
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline_e2e.json")
+# Per-item stage -> app.metrics stage whose histogram gives its latency; save and pdf are one call each
+STAGES = {"extract": "extract", "parse": "parse", "rank": "score"}
+
+class StubEmbedder:
+    """Deterministic hashed bag-of-words vectors; same interface as SentenceTransformer.encode()."""
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, sentences, **kwargs):
+        if isinstance(sentences, str):
+            return self._vector(sentences)
+        return np.stack([self._vector(s) for s in sentences])
+
+def load_nlp():
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm"), "en_core_web_sm"
+    except OSError:
+        print("en_core_web_sm is not installed; using spacy.blank('en') (no NER, so parsing is faster "
+              "than in the app)", file=sys.stderr)
+        return spacy.blank("en"), "blank:en"
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+def stage_latencies() -> dict:
+    histograms = {s["labels"]["stage"]: s for s in metrics.snapshot()["histograms"].get(metrics.STAGE_METRIC, [])}
+    result = {}
+    for stage, metric_stage in STAGES.items():
+        h = histograms.get(metric_stage)
+        if h:
+            result[stage] = {"p50_ms": round(h["p50"] * 1000, 3), "p95_ms": round(h["p95"] * 1000, 3),
+                             "p99_ms": round(h["p99"] * 1000, 3)}
+    return result
+
+def run(args) -> dict:
+    config = {"count": args.count, "pages": list(args.pages), "formats": list(args.formats), "seed": args.seed,
+              "chunk_size": args.chunk_size}
+    corpus_dir = args.corpus or os.path.join(
+        tempfile.gettempdir(),
+        f"resume_bench_corpus_{args.count}_{args.pages[0]}-{args.pages[1]}_{'-'.join(args.formats)}_{args.seed}")
+    start = time.perf_counter()
+    paths = list(synthetic_corpus.generate(corpus_dir, args.count, args.pages, args.formats, args.seed))
+    print(f"Corpus ready in {time.perf_counter() - start:.1f}s: {corpus_dir}", file=sys.stderr)
+
+    nlp, nlp_name = load_nlp()
+    embedder = StubEmbedder()
+    jd = resume_parser.parse_job_description(
+        file_utils.extract_text_from_file(os.path.join(corpus_dir, "job_description.txt")), nlp)
+    # Warm imports (sklearn, fitz) so they don't land in the first item's latency
+    matcher.compute_semantic_similarity("warm up", "warm up", embedder)
+    metrics.reset()
+
+    stages = {name: {"items": 0, "seconds": 0.0} for name in ("extract", "parse", "rank", "save", "pdf")}
+    rss = {}
+    work_dir = tempfile.mkdtemp(prefix="resume_bench_")
+    storage.DB_PATH = os.path.join(work_dir, "bench.db")
+    storage.init_db()
+
+    def timed_stage(name, items, fn):
+        # Accumulated across chunks; RSS is the peak so far when the stage last ran
+        stage_start = time.perf_counter()
+        result = fn()
+        stages[name]["seconds"] += time.perf_counter() - stage_start
+        stages[name]["items"] += items
+        rss[name] = peak_rss_mib()
+        return result
+
+    def parse_chunk(chunk, texts):
+        parsed = []
+        for path, text in zip(chunk, texts):
+            data = resume_parser.parse_resume(text, nlp)
+            data["filename"] = os.path.basename(path)
+            parsed.append(data)
+        return parsed
+
+    def save_chunk(ranked_chunk, index):
+        if storage.save_results(ranked_chunk, f"Benchmark (chunk {index})") is None:
+            raise RuntimeError("saving benchmark results failed")
+
+    # Sustained ingestion: each chunk goes through extract -> parse_resume -> rank_resumes ->
+    # save_results (one session per chunk) before the next is read. Only the slim ranked entries
+    # (no resume text) are kept, and the sorted chunks are merged into the final ranking for the PDF.
+    text_bytes = 0
+    ranked_chunks = []
+    for offset in range(0, len(paths), args.chunk_size):
+        chunk = paths[offset:offset + args.chunk_size]
+        texts = timed_stage("extract", len(chunk), lambda: [file_utils.extract_text_from_file(p) for p in chunk])
+        text_bytes += sum(len(t) for t in texts)
+        parsed = timed_stage("parse", len(texts), lambda: parse_chunk(chunk, texts))
+        del texts
+        ranked_chunk = timed_stage("rank", len(parsed), lambda: matcher.rank_resumes(parsed, jd, embedder))
+        del parsed
+        timed_stage("save", len(ranked_chunk), lambda: save_chunk(ranked_chunk, len(ranked_chunks)))
+        for entry in ranked_chunk:
+            entry["parsed_data"].pop("full_text", None)
+        ranked_chunks.append(ranked_chunk)
+        del ranked_chunk
+    ranked = timed_stage("rank", 0, lambda: list(heapq.merge(*ranked_chunks, key=lambda e: e["score"], reverse=True)))
+    del ranked_chunks
+    pdf_path = os.path.join(work_dir, "report.pdf")
+    timed_stage("pdf", len(ranked), lambda: pdf_exporter.export_results_to_pdf(
+        ranked, jd, pdf_path, "Benchmark", top_n=args.report_top_n or None))
+    for name, stage in stages.items():
+        # Rate from the unrounded time; a tiny corpus can finish a stage in well under a millisecond
+        stage["items_per_s"] = round(stage["items"] / max(stage["seconds"], 1e-9), 2)
+        stage["seconds"] = round(stage["seconds"], 3)
+        print(f"  {name:<8} {stage['seconds']:8.2f}s", file=sys.stderr)
+    mib = text_bytes / 2 ** 20
+
+    for stage, latencies in stage_latencies().items():
+        stages[stage].update(latencies)
+    total = sum(s["seconds"] for s in stages.values())
+    return {
+        "config": config,
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "spacy_pipeline": nlp_name, "embedder": "stub",
+                        "save": "save_results per chunk"},
+        "corpus_text_mib": round(mib, 1),
+        "stages": stages,
+        "end_to_end": {"seconds": round(total, 3), "resumes_per_s": round(args.count / max(total, 1e-9), 2)},
+        "peak_rss_mib": peak_rss_mib(),
+        "peak_rss_after_stage_mib": rss,
+    }
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Prints a comparison table; returns the regressions beyond tolerance."""
+    regressions = []
+    print(f"\n{'stage':<9}{'items/s':>12}{'baseline':>12}{'change':>9}{'p95 ms':>10}{'baseline':>10}")
+    for stage, current in result["stages"].items():
+        base = baseline["stages"].get(stage)
+        if not base:
+            continue
+        change = current["items_per_s"] / base["items_per_s"] - 1
+        p95 = (f"{current['p95_ms']:>10.2f}{base['p95_ms']:>10.2f}" if "p95_ms" in current and "p95_ms" in base
+               else f"{'-':>10}{'-':>10}")
+        print(f"{stage:<9}{current['items_per_s']:>12.1f}{base['items_per_s']:>12.1f}{change:>+9.0%}{p95}")
+        if change < -tolerance:
+            regressions.append(f"{stage} throughput {change:+.0%}")
+    rss_change = result["peak_rss_mib"] / baseline["peak_rss_mib"] - 1
+    print(f"peak RSS {result['peak_rss_mib']} MiB vs {baseline['peak_rss_mib']} MiB ({rss_change:+.0%})")
+    if rss_change > tolerance:
+        regressions.append(f"peak RSS {rss_change:+.0%}")
+    return regressions
+
+def print_result(result: dict):
+    print(f"{result['config']['count']} resumes, {result['corpus_text_mib']} MiB of text, "
+          f"spaCy {result['environment']['spacy_pipeline']}, stub embedder")
+    print(f"{'stage':<9}{'items/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MiB':>10}")
+    for stage, s in result["stages"].items():
+        latency = "".join(f"{s[k]:>10.2f}" if k in s else f"{'-':>10}" for k in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{stage:<9}{s['items_per_s']:>12.1f}{latency}{result['peak_rss_after_stage_mib'][stage]:>10.1f}")
+    print(f"end to end: {result['end_to_end']['seconds']}s ({result['end_to_end']['resumes_per_s']} resumes/s), "
+          f"peak RSS {result['peak_rss_mib']} MiB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=300, help="Resumes to generate (up to 100k)")
+    parser.add_argument("--pages", type=synthetic_corpus.parse_pages, default=(1, 3), help="e.g. 2 or 1-20")
+    parser.add_argument("--formats", default="pdf,docx,txt")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=256, help="Resumes per pipeline chunk")
+    parser.add_argument("--corpus", help="Corpus directory (default: cached under the temp dir)")
+    parser.add_argument("--report-top-n", type=int, default=0, help="Limit the PDF to the top N (0 = all)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", help="Also write the result here")
+    args = parser.parse_args(argv)
+    args.formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+
+    result = run(args)
+    print_result(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    if baseline["config"] != result["config"]:
+        print(f"\nBaseline was recorded with {baseline['config']}; not comparing.")
+        return 0
+    if baseline["environment"]["spacy_pipeline"] != result["environment"]["spacy_pipeline"]:
+        print(f"\nNote: baseline used spaCy {baseline['environment']['spacy_pipeline']}; parse numbers differ for that reason.")
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("Regressions beyond tolerance: " + "; ".join(regressions))
+        return 1 if args.fail_on_regression else 0
+    print("No regressions beyond tolerance.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
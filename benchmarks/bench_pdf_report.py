@@ -0,0 +1,72 @@
+"""
+Times PDF report generation for synthetic rankings.
+
+    python benchmarks/bench_pdf_report.py [--rows 100 10000 100000] [--top-n 500] [--skills short long]
+
+"short" rows list up to 8 short skills; "long" rows list 40 multi-word skills, so every skills
+cell has to be truncated to fit its column.
+
+Wall time is measured without tracing; peak Python heap is measured in a second,
+traced run (tracemalloc slows rendering down several times).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import pdf_exporter
+
+SKILLS = ["Python", "Java", "C++", "Data Science", "Machine Learning", "AWS", "React", "Django"]
+LONG_SKILLS = [f"{area} {tool}" for area in ("Distributed Systems", "Cloud Infrastructure", "Data Engineering",
+                                             "Natural Language Processing", "Site Reliability")
+               for tool in ("Kubernetes", "Terraform", "Apache Spark", "PostgreSQL", "Elasticsearch",
+                            "TensorFlow", "Prometheus", "Kafka Streams")]
+# skill profile -> (skill pool, (min, max) skills per row)
+SKILL_PROFILES = {"short": (SKILLS, (1, len(SKILLS))), "long": (LONG_SKILLS, (40, 40))}
+JD = {"required_skills": ["Python", "AWS"], "experience_requirements": 3,
+      "education_requirements": ["Bachelor's"], "full_text": "Synthetic JD"}
+
+def make_ranking(n, profile="short"):
+    rng = random.Random(n)
+    pool, (low, high) = SKILL_PROFILES[profile]
+    ranked = [{
+        "filename": f"candidate_{i:06d}_resume.pdf",
+        "score": round(rng.uniform(0, 100), 2),
+        "parsed_data": {"skills": rng.sample(pool, rng.randint(low, high))},
+    } for i in range(n)]
+    return sorted(ranked, key=lambda r: r["score"], reverse=True)
+
+def run(ranked, top_n, out_dir):
+    path = os.path.join(out_dir, f"report_{len(ranked)}_{top_n}.pdf")
+    start = time.perf_counter()
+    pdf_exporter.export_results_to_pdf(ranked, JD, path, "Benchmark Role", top_n=top_n)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    tracemalloc.start()
+    pdf_exporter.export_results_to_pdf(ranked, JD, path, "Benchmark Role", top_n=top_n)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--top-n", type=int, default=500)
+    parser.add_argument("--skills", nargs="+", choices=sorted(SKILL_PROFILES), default=["short", "long"])
+    args = parser.parse_args()
+    print(f"{'rows':>8} {'skills':>7} {'mode':>10} {'seconds':>9} {'peak MiB':>9} {'size KiB':>9}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for profile in args.skills:
+            for n in args.rows:
+                ranked = make_ranking(n, profile)
+                for label, top_n in (("full", None), (f"top-{args.top_n}", args.top_n)):
+                    elapsed, peak, size = run(ranked, top_n, out_dir)
+                    print(f"{n:>8} {profile:>7} {label:>10} {elapsed:>9.2f} {peak / 2**20:>9.1f} {size / 1024:>9.0f}")
+
+if __name__ == "__main__":
+    main()
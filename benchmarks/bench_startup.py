@@ -0,0 +1,78 @@
+"""
+Measures app start-up: cold import time of each module ui.py may load, and time to first
+paint (one full run of ui.py in Streamlit's AppTest, i.e. what a new session waits for
+before the page is interactive).
+
+    python benchmarks/bench_startup.py [--root PATH] [--runs 3] [--placeholder-models]
+
+Every measurement runs in a fresh interpreter so nothing is already imported. With
+--placeholder-models, app.models.load_models is replaced by a stub that returns at once, so
+first paint is measured without spaCy/MiniLM load time (and without needing the models installed).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["streamlit", "pandas", "app.storage", "app.file_utils", "app.resume_parser", "app.matcher",
+           "app.pdf_exporter", "app.email_utils", "app.voice_input", "app.models"]
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+    print(time.perf_counter() - start)
+except Exception as e:
+    print(-1)
+"""
+
+FIRST_PAINT_SNIPPET = """
+import json, os, sys, tempfile, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+if sys.argv[2] == "placeholder":
+    import app.models
+    app.models.load_models = lambda *args, **kwargs: (None, None)
+os.chdir(tempfile.mkdtemp())
+at = AppTest.from_file(os.path.join(sys.argv[1], "ui.py"), default_timeout=600)
+at.run()
+print(json.dumps({"seconds": time.perf_counter() - start, "exceptions": len(at.exception)}))
+"""
+
+def _run(snippet, *args, root):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    out = subprocess.run([sys.executable, "-c", snippet, *args], capture_output=True, text=True, env=env, cwd=root)
+    return out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", default=ROOT, help="Project tree to measure (e.g. a git worktree of an older commit)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--placeholder-models", action="store_true",
+                        help="Stub out model loading so first paint excludes spaCy/MiniLM load time")
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+
+    print(f"Cold import time (median of {args.runs}):")
+    for module in MODULES:
+        samples = [float(_run(IMPORT_SNIPPET, module, root=root) or -1) for _ in range(args.runs)]
+        if min(samples) < 0:
+            print(f"  {module:<20} not importable here")
+        else:
+            print(f"  {module:<20} {statistics.median(samples) * 1000:8.0f} ms")
+
+    paints = []
+    for _ in range(args.runs):
+        result = _run(FIRST_PAINT_SNIPPET, root, "placeholder" if args.placeholder_models else "real", root=root)
+        paints.append(json.loads(result) if result.startswith("{") else {"seconds": float("nan"), "exceptions": -1})
+    seconds = [p["seconds"] for p in paints]
+    print(f"Time to first paint (median of {args.runs}): {statistics.median(seconds):.2f} s"
+          f"  [runs: {', '.join(f'{s:.2f}' for s in seconds)}; script exceptions: {paints[0]['exceptions']}]")
+
+if __name__ == "__main__":
+    main()
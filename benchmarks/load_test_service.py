@@ -0,0 +1,90 @@
+"""
+Load test for the HTTP scoring service.
+
+    python -m app.scoring_service --port 8000 &
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8000 --endpoint score --concurrency 16 --requests 500
+
+Sends requests from concurrent client threads and reports p50/p99 latency and requests/second.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _read_sample(name):
+    with open(os.path.join(ROOT, "sample-data", name), encoding="utf-8") as fh:
+        return fh.read()
+
+def build_payload(endpoint: str, i: int) -> dict:
+    resume = _read_sample("resume1.txt") + f"\nReference {i}"
+    jd = _read_sample("job_des.txt")
+    if endpoint == "parse":
+        return {"text": resume, "kind": "resume"}
+    if endpoint == "score":
+        return {"resume": resume, "jd": jd}
+    return {"resumes": [{"filename": f"resume_{i}_{n}.txt", "text": resume + f" {n}"} for n in range(5)], "jd": jd}
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["parse", "score", "rank"], default="score")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            body = json.dumps(build_payload(args.endpoint, i)).encode("utf-8")
+            request = urllib.request.Request(f"{args.url}/{args.endpoint}", data=body,
+                                             headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        print(f"All {len(errors)} requests failed, e.g.: {errors[:1]}", file=sys.stderr)
+        return 1
+    print(f"{args.endpoint}: {len(latencies)} ok, {len(errors)} errors, concurrency {args.concurrency}")
+    print(f"  throughput {len(latencies) / elapsed:.1f} req/s")
+    print(f"  latency p50 {percentile(latencies, 50) * 1000:.1f} ms  p99 {percentile(latencies, 99) * 1000:.1f} ms"
+          f"  mean {statistics.fmean(latencies) * 1000:.1f} ms")
+    with urllib.request.urlopen(f"{args.url}/stats", timeout=10) as response:
+        stats = json.loads(response.read())
+    print(f"  encode batches: avg {stats['encode']['avg_batch']} items, max {stats['encode']['max_batch']}")
+    print(f"  parse batches:  avg {stats['parse']['avg_batch']} items, max {stats['parse']['max_batch']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Generates synthetic resumes (and a matching job description) in the formats file_utils reads.
+
+    python benchmarks/synthetic_corpus.py --out /tmp/corpus --count 1000 --pages 1-20 --formats pdf,docx,txt
+
+Resumes have a name, contact line, summary, skills, dated experience entries, education and
+enough project write-ups to fill the requested number of pages (about 3,000 characters each).
+Output is deterministic for a given --seed. Files are written one at a time, so 100k resumes
+need disk space but not memory. DOCX files are written as minimal WordprocessingML packages
+with zipfile, so no extra dependency is needed.
+"""
+import argparse
+import os
+import random
+import sys
+import zipfile
+from typing import Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+CHARS_PER_PAGE = 3000
+FORMATS = ("pdf", "docx", "txt")
+
+FIRST_NAMES = ["Asha", "Ben", "Carlos", "Deepa", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+               "Kavya", "Liam", "Maya", "Nikhil", "Olga", "Priya", "Quinn", "Ravi", "Sara", "Tomas"]
+LAST_NAMES = ["Anand", "Brooks", "Chen", "Dubois", "Evans", "Fernandes", "Gupta", "Hansen", "Ito", "Jones",
+              "Kumar", "Lopez", "Mehta", "Novak", "Okafor", "Patel", "Reddy", "Silva", "Tanaka", "Weber"]
+SKILLS = ["Python", "Java", "C++", "Data Science", "Machine Learning", "AWS", "React", "Django",
+          "SQL", "Docker", "Kubernetes", "Go", "TypeScript", "Spark", "Airflow", "PostgreSQL", "Terraform"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "Backend Developer",
+          "Machine Learning Engineer", "Data Analyst", "Engineering Manager", "DevOps Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech",
+             "Hooli", "Vandelay Imports", "Cyberdyne Systems", "Soylent Foods"]
+DEGREES = ["Bachelor of Technology in Computer Science", "B.S. in Computer Science", "Master of Science in Data Science",
+           "M.Tech in Software Engineering", "Bachelor of Engineering in Electronics", "PhD in Machine Learning"]
+UNIVERSITIES = ["State University", "Institute of Technology", "National University", "City College"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Maintained", "Shipped"]
+OBJECTS = ["a streaming ingestion pipeline", "the billing service", "an internal ML platform", "customer dashboards",
+           "a recommendation engine", "the CI/CD system", "a feature store", "the search backend", "ETL jobs"]
+OUTCOMES = ["cutting latency by {n}%", "serving {n}k requests per second", "reducing cloud spend by {n}%",
+            "improving conversion by {n}%", "onboarding {n} teams", "halving incident volume"]
+
+def parse_pages(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+def resume_text(index: int, pages: int, rng: random.Random) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(3, 9))
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{index}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with hands-on experience in {', '.join(skills[:3])}.",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "EXPERIENCE",
+    ]
+    year = 2025
+    for _ in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 5)
+        end = "Present" if year == 2025 else f"{rng.choice(MONTHS)} {year}"
+        lines += [rng.choice(TITLES), f"{rng.choice(COMPANIES)}, {rng.choice(MONTHS)} {start} - {end}"]
+        year = start
+    lines += ["", "EDUCATION", f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {year - 4}", "", "PROJECTS"]
+    target = pages * CHARS_PER_PAGE
+    size = sum(len(line) + 1 for line in lines)
+    while size < target:
+        outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+        line = f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, {outcome}."
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+def job_description_text() -> str:
+    return ("Senior Backend Engineer\n"
+            "We are looking for an engineer with 4+ years of experience building data-heavy services.\n"
+            "Required skills: Python, AWS, SQL, Docker, Machine Learning.\n"
+            "Education: Bachelor's degree in Computer Science or equivalent.\n")
+
+def write_txt(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+
+def write_pdf(path: str, text: str):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", size=10)
+    for line in text.splitlines():
+        pdf.multi_cell(0, 5, line.encode("latin-1", "replace").decode("latin-1") or " ")
+    pdf.output(path, "F")
+
+_CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                  '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                  '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                  '<Default Extension="xml" ContentType="application/xml"/>'
+                  '<Override PartName="/word/document.xml" '
+                  'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                  '</Types>')
+_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+         '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+         'Target="word/document.xml"/></Relationships>')
+
+def write_docx(path: str, text: str):
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                         for line in text.splitlines())
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{paragraphs}</w:body></w:document>')
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("word/document.xml", document)
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+def generate(out_dir: str, count: int, pages: Tuple[int, int] = (1, 2), formats=FORMATS,
+             seed: int = 7) -> Iterator[str]:
+    """Writes count resumes (formats used round-robin) plus job_description.txt; yields each resume path."""
+    os.makedirs(out_dir, exist_ok=True)
+    write_txt(os.path.join(out_dir, "job_description.txt"), job_description_text())
+    for i in range(count):
+        rng = random.Random(seed * 1_000_003 + i)
+        fmt = formats[i % len(formats)]
+        path = os.path.join(out_dir, f"resume_{i:06d}.{fmt}")
+        if not os.path.exists(path):
+            WRITERS[fmt](path, resume_text(i, rng.randint(*pages), rng))
+        yield path
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--pages", type=parse_pages, default=(1, 2), help="Pages per resume, e.g. 3 or 1-20")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unsupported formats: {', '.join(sorted(unknown))}")
+    n = sum(1 for _ in generate(args.out, args.count, args.pages, formats, args.seed))
+    print(f"Wrote {n} resumes to {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
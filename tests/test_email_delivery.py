@@ -0,0 +1,112 @@
+"""
+Delivery queue against a local SMTP stand-in: one connection for many reports, attachments
+survive their source file being removed, and only network errors are retried.
+"""
+import os
+import socketserver
+import threading
+
+import pytest
+
+from app import email_utils
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+    def reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 localhost stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command.startswith("DATA"):
+                self.reply("354 end with .")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b".\n", b""):
+                        break
+                    data.append(chunk)
+                with server.lock:
+                    server.messages.append(b"".join(data))
+                self.reply("250 queued")
+            elif command.startswith("QUIT"):
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+class _SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _delivery_queue(server, **kwargs):
+    port = server.server_address[1]
+    factory = lambda: email_utils.SMTPConnection(
+        user="reports@example.com", host="127.0.0.1", port=port,
+        smtp_ssl=False, smtp_starttls=False, smtp_skip_login=True)
+    return email_utils.EmailDeliveryQueue(connection_factory=factory, **kwargs)
+
+def test_reports_share_one_connection(smtp_server):
+    delivery = _delivery_queue(smtp_server)
+    try:
+        jobs = [delivery.submit(f"hr{i}@example.com", f"Report {i}", "See attached.") for i in range(25)]
+        assert all(job.future.result(timeout=30) for job in jobs)
+    finally:
+        delivery.close(timeout=10)
+    assert len(smtp_server.messages) == 25
+    assert smtp_server.connections == 1
+    assert delivery.stats()["connections_opened"] == 1
+
+def test_attachment_is_copied_at_submit(smtp_server, tmp_path):
+    report = tmp_path / "Report_abc.pdf"
+    report.write_bytes(b"%PDF-1.3 stand-in report")
+    delivery = _delivery_queue(smtp_server)
+    try:
+        job = delivery.submit("hr@example.com", "Report", "See attached.", [str(report)])
+        report.unlink()   # e.g. evicted from the report cache before the worker gets to it
+        assert job.future.result(timeout=30)
+    finally:
+        delivery.close(timeout=10)
+    assert b"Report_abc.pdf" in smtp_server.messages[0]
+    assert not os.path.exists(job.attachments[0])
+
+def test_missing_attachment_is_rejected_up_front(tmp_path):
+    delivery = email_utils.EmailDeliveryQueue(connection_factory=lambda: pytest.fail("should not connect"))
+    try:
+        with pytest.raises(FileNotFoundError):
+            delivery.submit("hr@example.com", "Report", "See attached.", [str(tmp_path / "gone.pdf")])
+    finally:
+        delivery.close(timeout=10)
+
+@pytest.mark.parametrize("error, transient", [
+    (ConnectionResetError(), True),
+    (TimeoutError(), True),
+    (FileNotFoundError("report.pdf"), False),
+    (PermissionError("report.pdf"), False),
+])
+def test_only_network_errors_are_transient(error, transient):
+    assert email_utils._is_transient(error) is transient
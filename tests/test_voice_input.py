@@ -0,0 +1,75 @@
+"""
+Streaming voice capture with StubRecognizer and synthetic audio: speech is chunked at pauses,
+capture stops on silence rather than at max_duration, and a silent device can't hang capture.
+"""
+import sys
+import time
+import types
+
+import numpy as np
+
+from app import voice_input
+
+RATE = 44100
+
+def _noise(seconds: float, level: float = 50.0) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(RATE * seconds)) * level).astype(np.int16)
+
+def _tone(seconds: float, level: float = 8000.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * level).astype(np.int16)
+
+def _blocks(audio: np.ndarray, block_ms: int = 30):
+    size = RATE * block_ms // 1000
+    for start in range(0, len(audio), size):
+        yield audio[start:start + size]
+
+def test_chunks_at_pauses_and_stops_on_silence():
+    # Noise floor, two phrases split by a pause, then a long silence the capture should not wait out
+    audio = np.concatenate([_noise(0.5), _tone(1.0), _noise(0.8), _tone(1.2), _noise(10.0)])
+    recognizer = voice_input.StubRecognizer(["senior python engineer", "with aws experience"])
+    consumed = []
+
+    def tracked(blocks):
+        for block in blocks:
+            consumed.append(len(block))
+            yield block
+
+    text = voice_input.transcribe_blocks(tracked(_blocks(audio)), RATE, recognizer, max_duration=15)
+    assert text == "senior python engineer with aws experience"
+    assert recognizer.calls == 2
+    # Stopped about SILENCE_TIMEOUT after the speech, long before the 14.5 s of audio ran out
+    assert sum(consumed) / RATE < 6.0
+
+def test_recognizer_gets_16khz_pcm():
+    seen = []
+    recognizer = voice_input.StubRecognizer(fn=lambda pcm, rate: seen.append((len(pcm), rate)) or "ok")
+    audio = np.concatenate([_noise(0.5), _tone(1.0), _noise(3.0)])
+    assert voice_input.transcribe_blocks(_blocks(audio), RATE, recognizer) == "ok"
+    (size, rate), = seen
+    assert rate == voice_input.TARGET_RATE
+    # int16 samples covering roughly the phrase plus the closing pause
+    assert 1.0 <= size / 2 / voice_input.TARGET_RATE <= 2.5
+
+def test_no_speech_returns_empty():
+    recognizer = voice_input.StubRecognizer(["never used"])
+    assert voice_input.transcribe_blocks(_blocks(_noise(8.0)), RATE, recognizer) == ""
+    assert recognizer.calls == 0
+
+def test_silent_device_stops_at_deadline(monkeypatch):
+    class InputStream:
+        """An input device whose callback never fires."""
+        def __init__(self, **kwargs):
+            pass
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            return False
+
+    fake = types.SimpleNamespace(InputStream=InputStream)
+    monkeypatch.setitem(sys.modules, "sounddevice", fake)
+    start = time.monotonic()
+    blocks = list(voice_input.microphone_blocks(16000, max_seconds=1.0))
+    assert blocks == []
+    assert time.monotonic() - start < 3.0
@@ -5,29 +5,73 @@ from datetime import datetime
 import tempfile
 import uuid
 
-from app import file_utils, resume_parser, matcher, storage, pdf_exporter, email_utils, voice_input
+from app import file_utils, resume_parser, storage, data_exporter, models, model_worker, metrics
+from app.screening_session import ScreeningSession
+from app.blob_store import BlobStore
+# voice_input (sounddevice/PortAudio), email_utils (yagmail) and pdf_exporter (fpdf) are
+# imported where their feature is used, so they stay off the first-paint path.
 
+st.set_page_config(layout="wide", page_title="AI Resume Screening & Ranking Agent")
 
-storage.init_db()
+@st.cache_resource
+def init_storage():
+    # Once per server process, not on every rerun
+    storage.init_db()
+    if os.getenv("DB_WRITE_BEHIND", "").lower() in ("1", "true", "yes"):
+        storage.enable_write_behind()
+    return True
+
+init_storage()
+
+@st.cache_resource
+def start_metrics_endpoint():
+    # METRICS_PORT=9108 serves /metrics (Prometheus) and /metrics.json for this server process
+    port = os.getenv("METRICS_PORT")
+    return metrics.start_http_server(int(port)) if port else None
+
+start_metrics_endpoint()
 
-st.set_page_config(layout="wide", page_title="AI Resume Screening & Ranking Agent")
 st.title("AI Resume Screening & Ranking Agent")
 st.markdown(
     "Automate your recruitment. Upload a job description, resumes, and let AI rank candidates by relevance."
 )
 
 
-import spacy
-from sentence_transformers import SentenceTransformer
+# MODEL_WORKER=1 moves spaCy and the embedder into one shared worker process for all sessions
+USE_MODEL_WORKER = os.getenv("MODEL_WORKER", "").lower() in ("1", "true", "yes")
+
+def _load_worker():
+    worker = model_worker.ensure_worker()
+    return worker, worker
 
 @st.cache_resource
+def start_model_loading():
+    # Loads in a background thread so the page renders (and the JD upload works) meanwhile
+    return models.load_models_in_background(_load_worker if USE_MODEL_WORKER else models.load_models)
+
 def load_nlp_models():
-    # Use lightweight models for Cloud deployment
-    nlp = spacy.load("en_core_web_sm")  # en_core_web_sm must be in requirements.txt
-    embedder = SentenceTransformer("all-MiniLM-L6-v2")
-    return nlp, embedder
+    """Returns (nlp, embedder), waiting for the background load if it hasn't finished yet."""
+    future = start_model_loading()
+    if future.done() and future.exception() is not None:
+        # An earlier load failed; cache_resource would keep handing out that failure, so start over
+        start_model_loading.clear()
+        future = start_model_loading()
+    if not future.done():
+        with st.spinner("Loading NLP models..."):
+            future.exception()
+    if future.exception() is not None:
+        start_model_loading.clear()
+    return future.result()
+
+start_model_loading()
 
-nlp, embedder = load_nlp_models()
+def parse_resume_text(text):
+    nlp, _ = load_nlp_models()
+    return nlp.parse_resume(text) if USE_MODEL_WORKER else resume_parser.parse_resume(text, nlp)
+
+def parse_jd_text(text):
+    nlp, _ = load_nlp_models()
+    return nlp.parse_job_description(text) if USE_MODEL_WORKER else resume_parser.parse_job_description(text, nlp)
 
 
 
@@ -39,10 +83,19 @@ for key, default in [
     ('parsed_resumes_data', []),
     ('ranked_results', []),
     ('current_job_title', ""),
-    ('email_recipient', "")
+    ('email_recipient', ""),
+    ('pending_save', None),
+    ('report_session_id', str(uuid.uuid4())),
+    ('email_job_ids', []),
+    ('screening', None),
+    ('screening_running', False),
+    ('profile_report', None)
 ]:
     if key not in st.session_state:
         st.session_state[key] = default
+if st.session_state.screening is None:
+    # Upload bytes and resume texts spill to disk; session state keeps only their handles
+    st.session_state.screening = ScreeningSession(blobs=BlobStore(st.session_state.report_session_id))
 
 # --- Helper Functions ---
 def process_jd(jd_content, jd_filename):
@@ -55,7 +108,7 @@ def process_jd(jd_content, jd_filename):
 
         full_text = file_utils.extract_text_from_file(temp_jd_path)
         if full_text and full_text.strip():
-            st.session_state.parsed_jd = resume_parser.parse_job_description(full_text, nlp)
+            st.session_state.parsed_jd = parse_jd_text(full_text)
             st.success(f"Job Description '{jd_filename}' processed.")
             suggested_title = (
                 st.session_state.parsed_jd.get('title')
@@ -76,38 +129,43 @@ def process_jd(jd_content, jd_filename):
         if temp_jd_path and os.path.exists(temp_jd_path):
             os.remove(temp_jd_path)
 
-def process_resumes(uploaded_files):
-    st.session_state.parsed_resumes_data = []
-    st.session_state.uploaded_resumes = []
+def _parse_upload(filename, content):
+    # None only when no text can be extracted; other errors propagate so the next sync retries the file
+    temp_path = ''
     temp_dir = "temp_resumes"
     os.makedirs(temp_dir, exist_ok=True)
-    for uploaded_file in uploaded_files:
-        temp_path = ''
-        try:
-            ext = os.path.splitext(uploaded_file.name)[1]
-            temp_path = os.path.join(temp_dir, f"{uuid.uuid4()}{ext}")
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            resume_text = file_utils.extract_text_from_file(temp_path)
-            if resume_text:
-                parsed = resume_parser.parse_resume(resume_text, nlp)
-                parsed['filename'] = uploaded_file.name
-                st.session_state.parsed_resumes_data.append(parsed)
-                st.session_state.uploaded_resumes.append({
-                    'filename': uploaded_file.name,
-                    'content': uploaded_file.getbuffer()
-                })
-                st.success(f"Processed resume: {uploaded_file.name}")
-            else:
-                st.warning(f"Could not extract text from: {uploaded_file.name}")
-        except Exception as e:
-            st.error(f"Error processing {uploaded_file.name}: {e}")
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
-    # Clean up dir if empty
-    if not os.listdir(temp_dir):
-        os.rmdir(temp_dir)
+    try:
+        temp_path = os.path.join(temp_dir, f"{uuid.uuid4()}{os.path.splitext(filename)[1]}")
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        resume_text = file_utils.extract_text_from_file(temp_path)
+        return parse_resume_text(resume_text) if resume_text else None
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        # Clean up dir if empty
+        if os.path.isdir(temp_dir) and not os.listdir(temp_dir):
+            os.rmdir(temp_dir)
+
+def process_resumes(uploaded_files):
+    # Only files whose content is new to this session are parsed; removed files drop out of the ranking
+    session = st.session_state.screening
+    changes = session.sync([(f.name, f.getbuffer()) for f in uploaded_files], _parse_upload)
+    st.session_state.uploaded_resumes = [{'filename': f.name, 'size': f.size} for f in uploaded_files]
+    st.session_state.parsed_resumes_data = session.parsed_resumes()
+    for name in changes["added"]:
+        st.success(f"Processed resume: {name}")
+    for name in changes["failed"]:
+        st.warning(f"Could not extract text from: {name}")
+    for name, error in changes["errors"]:
+        st.error(f"Error processing {name}: {error}. It will be retried on the next run.")
+    for name in changes["duplicates"]:
+        st.warning(f"Skipped {name}: same content as another uploaded resume.")
+    if changes["removed"]:
+        st.info(f"Removed {len(changes['removed'])} resume(s) from the session.")
+    # Keep an existing ranking current: only the added resumes need scoring
+    if st.session_state.ranked_results and (changes["added"] or changes["removed"]):
+        st.session_state.ranked_results = session.rank(st.session_state.parsed_jd, load_nlp_models()[1])
 
 def get_display_data(ranked):
     table = []
@@ -126,6 +184,17 @@ def get_display_data(ranked):
         })
     return table
 
+def get_report_path(top_n=0):
+    from app import pdf_exporter
+    # Download and email share one cached render per (session, results)
+    return pdf_exporter.get_or_create_report(
+        st.session_state.ranked_results,
+        st.session_state.parsed_jd,
+        st.session_state.report_session_id,
+        st.session_state.current_job_title,
+        top_n=top_n or None
+    )
+
 # ----- Step 1: Job Description -----
 st.header("1. Provide Job Description")
 jd_method = st.radio(
@@ -145,6 +214,7 @@ if jd_method == "Upload File":
 else:
     st.info("Press 'Record' and narrate the job description, then wait for processing.")
     if st.button("Record Job Description"):
+        from app import voice_input
         with st.spinner("Listening..."):
             text = voice_input.get_jd_from_voice()
         if text:
@@ -174,30 +244,97 @@ resume_files = st.file_uploader(
     accept_multiple_files=True,
     key="resume_uploader"
 )
-if resume_files and st.session_state.parsed_jd:
-    cur_names = {f.name for f in resume_files}
-    prev_names = {f['filename'] for f in st.session_state.uploaded_resumes}
-    # Only re-parse if new files uploaded
-    if cur_names != prev_names or not st.session_state.parsed_resumes_data:
-        process_resumes(resume_files)
+if st.session_state.parsed_jd:
+    cur_uploads = [(f.name, f.size) for f in resume_files or []]
+    prev_uploads = [(r['filename'], r['size']) for r in st.session_state.uploaded_resumes]
+    # Cheap check first; process_resumes diffs by content hash and parses only new files.
+    # Resumes whose blobs were garbage-collected while this session sat idle are parsed again too.
+    if cur_uploads != prev_uploads or st.session_state.screening.drop_missing_blobs():
+        process_resumes(resume_files or [])
 elif not st.session_state.parsed_jd:
     st.info("Please provide a job description before uploading resumes.")
 
 # ----- Step 3: Run Screening -----
 st.header("3. Run Screening & View Results")
 can_run = st.session_state.parsed_jd and st.session_state.parsed_resumes_data
+
+# A run still marked as in progress here was interrupted by "Stop screening" (or a widget change);
+# the candidates scored before that stay ranked and the next run only scores the rest.
+if st.session_state.screening_running:
+    st.session_state.screening_running = False
+    st.warning(f"Screening stopped: {len(st.session_state.ranked_results)} of "
+               f"{len(st.session_state.parsed_resumes_data)} candidates ranked. Run again to finish.")
+
 if st.button("Run Screening & Rank Resumes", disabled=not can_run):
-    with st.spinner("AI screening and ranking..."):
-        st.session_state.ranked_results = matcher.rank_resumes(
-            st.session_state.parsed_resumes_data,
-            st.session_state.parsed_jd,
-	    embedder=embedder
-        )
+    embedder = load_nlp_models()[1]
+    st.session_state.screening_running = True
+    # Clicking it reruns the script, which interrupts the loop below at its next UI update
+    st.button("Stop screening")
+    progress_bar = st.progress(0.0, text="Scoring candidates...")
+    leaderboard = st.empty()
+    profile_run = st.session_state.get("profile_next_run", False) or metrics.profiling_requested()
+    with metrics.profile(enabled=profile_run) as profile_report:
+        # Scores only candidates not yet ranked against this JD; a changed JD rescores everything
+        for progress in st.session_state.screening.iter_rank(st.session_state.parsed_jd, embedder):
+            st.session_state.ranked_results = list(st.session_state.screening.ranked)
+            progress_bar.progress(progress["scored"] / progress["total"],
+                                  text=f"Scored {progress['scored']} of {progress['total']} candidates"
+                                       f" - about {progress['eta']:.0f}s left")
+            leaderboard.dataframe(pd.DataFrame(get_display_data(progress["top"])), use_container_width=True)
+    if profile_run:
+        st.session_state.profile_report = profile_report
+    st.session_state.ranked_results = list(st.session_state.screening.ranked)
+    st.session_state.screening_running = False
+    progress_bar.empty()
+    leaderboard.empty()
     st.success("Screening complete! See below for results.")
     title = st.session_state.current_job_title or "Untitled"
-    session_id = storage.save_results(st.session_state.ranked_results, title)
-    if session_id:
-        st.info(f"Results saved to database for session ID: {session_id}")
+    st.session_state.pending_save = storage.save_results_async(
+        st.session_state.screening.with_full_text(st.session_state.ranked_results), title)
+
+# Large runs can go to the durable job queue instead: they survive this tab closing and
+# are processed by `python -m app.jobs worker` processes, on this host or others
+if st.button("Run as Background Job", disabled=not (can_run and resume_files)):
+    from app import jobs
+    job_id = jobs.submit_uploads(
+        [(f.name, f.getbuffer()) for f in resume_files],
+        st.session_state.parsed_jd.get("full_text", ""),
+        st.session_state.current_job_title or "Untitled"
+    )
+    if job_id:
+        st.success(f"Queued background job {job_id}. Start workers with `python -m app.jobs worker`.")
+    else:
+        st.error("Failed to queue the background job.")
+
+with st.expander("Background Jobs"):
+    from app import jobs
+    job_rows = jobs.list_jobs()
+    if job_rows:
+        st.dataframe(pd.DataFrame([{
+            "Job ID": j["id"],
+            "Job Title": j["job_title"],
+            "Status": j["status"],
+            "Resumes": j["total_files"],
+            "Progress (%)": round(j["progress"] * 100, 1),
+            "Failed Chunks": j["chunks"]["failed"],
+            "Session ID": j["session_id"],
+        } for j in job_rows]), use_container_width=True)
+        st.caption("Finished jobs are saved as screening sessions; see Historical Screening below.")
+    else:
+        st.info("No background jobs yet.")
+
+# Report the save once the (possibly background) write has committed
+pending_save = st.session_state.pending_save
+if pending_save is not None:
+    if pending_save.done():
+        session_id = pending_save.result() if pending_save.exception() is None else None
+        if session_id:
+            st.info(f"Results saved to database for session ID: {session_id}")
+        else:
+            st.error("Failed to save results to database.")
+        st.session_state.pending_save = None
+    else:
+        st.info("Saving results to database in the background...")
 
 # Results table if available
 if st.session_state.ranked_results:
@@ -219,24 +356,21 @@ if st.session_state.ranked_results:
             file_name=f"ranked_{st.session_state.current_job_title or 'screening'}_{datetime.now():%Y%m%d_%H%M%S}.csv",
             mime="text/csv"
         )
+        report_top_n = st.number_input(
+            "Report only the top N candidates plus score summary (0 = all):",
+            min_value=0, value=0, step=10, key="report_top_n"
+        )
         if st.button("Generate PDF Report"):
             with st.spinner("Generating PDF..."):
-                pdf_path = f"Report_{uuid.uuid4()}.pdf"
-                path = pdf_exporter.export_results_to_pdf(
-                    st.session_state.ranked_results,
-                    st.session_state.parsed_jd,
-                    pdf_path,
-                    st.session_state.current_job_title
-                )
+                path = get_report_path(report_top_n)
                 if path and os.path.exists(path):
                     with open(path, "rb") as pdf_file:
                         st.download_button(
                             "Download PDF Report",
                             data=pdf_file.read(),
-                            file_name=os.path.basename(path),
+                            file_name=f"Report_{st.session_state.current_job_title or 'screening'}.pdf",
                             mime="application/pdf"
                         )
-                    os.remove(path)
                 else:
                     st.error("Failed to generate PDF.")
 
@@ -253,29 +387,40 @@ if st.session_state.ranked_results:
         Generated by AI Resume Screening & Ranking Agent.
         """
         if st.button("Email PDF Report"):
-            with st.spinner("Preparing and sending email..."):
-                tmp_pdf = f"Email_Report_{uuid.uuid4()}.pdf"
-                pdf_path = pdf_exporter.export_results_to_pdf(
-                    st.session_state.ranked_results,
-                    st.session_state.parsed_jd,
-                    tmp_pdf,
-                    st.session_state.current_job_title
-                )
+            from app import email_utils
+            with st.spinner("Preparing email..."):
+                pdf_path = get_report_path(report_top_n)
                 if pdf_path and os.path.exists(pdf_path):
-                    sent = email_utils.send_email_report(
+                    job = email_utils.enqueue_email_report(
                         to_email=recipient,
                         subject=subject,
                         body=body,
                         attachment_path=pdf_path
                     )
-                    if sent:
-                        st.success(f"Emailed report to {recipient}")
+                    if job:
+                        st.session_state.email_job_ids.append(job.job_id)
                     else:
-                        st.error("Failed to send email.")
-                    os.remove(pdf_path)
+                        st.error("Failed to queue email. Check EMAIL_SENDER / EMAIL_APP_PASSWORD and the logs.")
                 else:
                     st.error("Could not generate report for email.")
 
+        # Delivery happens in the background; show where each queued report stands
+        if st.session_state.email_job_ids:
+            from app import email_utils
+            delivery_queue = email_utils.get_delivery_queue()
+            for job_id in list(st.session_state.email_job_ids):
+                status = delivery_queue.status(job_id)
+                if status is None:
+                    st.session_state.email_job_ids.remove(job_id)
+                elif status["status"] == "sent":
+                    st.success(f"Emailed report to {status['to']}")
+                    st.session_state.email_job_ids.remove(job_id)
+                elif status["status"] == "failed":
+                    st.error(f"Failed to send email to {status['to']}: {status['error']}")
+                    st.session_state.email_job_ids.remove(job_id)
+                else:
+                    st.info(f"Email to {status['to']}: {status['status']} (attempt {status['attempts']})")
+
 import datetime
 
 # --- 5. Historical Results ---
@@ -327,6 +472,43 @@ if hist and len(hist) > 0:
     )
     st.dataframe(hist_df, use_container_width=True)   # SHOW Session ID in the UI
 
+    # --- Export History ---
+    st.markdown("### Export Screening History")
+    st.caption("Exports stream straight from the database with per-component scores, so they work for any number of rows.")
+    # Every stored session, not just the ones in the latest-100-rows table above
+    export_sessions = {s["session_id"]: s for s in storage.fetch_sessions()}
+    col_fmt, col_scope, col_title = st.columns(3)
+    export_fmt = col_fmt.selectbox("Format", list(data_exporter.EXPORT_FORMATS), key="export_fmt")
+    export_session = col_scope.selectbox(
+        "Session ID", ["All"] + list(export_sessions), key="export_session",
+        format_func=lambda sid: sid if sid == "All" else
+        f"{sid}: {export_sessions[sid]['job_title']} ({export_sessions[sid]['timestamp']}, {export_sessions[sid]['results']} results)"
+    )
+    export_title = col_title.text_input("Job title contains", key="export_title")
+    col_from, col_to = st.columns(2)
+    export_start = col_from.date_input("From date (optional)", value=None, key="export_start")
+    export_end = col_to.date_input("To date (optional)", value=None, key="export_end")
+    if st.button("Export History"):
+        with st.spinner(f"Exporting {export_fmt.upper()}..."):
+            export_path = data_exporter.export_results(
+                fmt=export_fmt,
+                session_id=None if export_session == "All" else int(export_session),
+                start_date=str(export_start) if export_start else None,
+                end_date=str(export_end) if export_end else None,
+                job_title=export_title or None
+            )
+        if export_path:
+            with open(export_path, "rb") as export_file:
+                st.download_button(
+                    f"Download {export_fmt.upper()} Export",
+                    data=export_file.read(),
+                    file_name=f"screening_history_{datetime.datetime.now():%Y%m%d_%H%M%S}{data_exporter.EXPORT_FORMATS[export_fmt]}",
+                    mime=data_exporter.MIME_TYPES[export_fmt]
+                )
+            os.remove(export_path)
+        else:
+            st.error(f"Failed to export history as {export_fmt.upper()}.")
+
     # --- Date Range Deletion ---
     st.markdown("### Delete Screening History by Date Range")
 
@@ -382,3 +564,58 @@ if hist and len(hist) > 0:
             st.error("Failed to delete session. Try again.")
 else:
     st.info("No historical results yet.")
+
+# --- 6. Candidate Archive Search ---
+st.header("6. Search Candidate Archive")
+st.caption(
+    "Search everyone screened so far without re-uploading files. "
+    "Supports AND / OR / NOT and \"quoted phrases\", e.g. `kubernetes AND golang`."
+)
+col_query, col_exp = st.columns([3, 1])
+archive_query = col_query.text_input("Search query", key="archive_query")
+archive_min_exp = col_exp.number_input("Min. experience (years)", min_value=0.0, value=0.0, step=1.0, key="archive_min_exp")
+if archive_query:
+    matches = storage.search_candidates(archive_query, min_experience=archive_min_exp or None)
+    if matches:
+        st.dataframe(
+            pd.DataFrame(matches)[['name', 'filename', 'total_experience_years', 'skills', 'email', 'snippet', 'session_id']].rename(
+                columns={
+                    'name': 'Name',
+                    'filename': 'Resume Filename',
+                    'total_experience_years': 'Total Exp (Years)',
+                    'skills': 'Skills',
+                    'email': 'Email',
+                    'snippet': 'Match',
+                    'session_id': 'Session ID'
+                }
+            ),
+            use_container_width=True
+        )
+    else:
+        st.info("No archived candidates match that search.")
+
+# --- Diagnostics ---
+with st.expander("Diagnostics"):
+    st.caption("Where time goes in this server process, per pipeline stage. Stages nest: 'score' includes 'embed'.")
+    stage_rows = metrics.stage_summary()
+    if stage_rows:
+        st.dataframe(pd.DataFrame(stage_rows), use_container_width=True)
+    else:
+        st.info("No pipeline activity recorded yet.")
+    counters = metrics.snapshot()["counters"]
+    if counters:
+        st.dataframe(pd.DataFrame([
+            {"Counter": name, "Labels": ", ".join(f"{k}={v}" for k, v in series["labels"].items()), "Value": series["value"]}
+            for name, values in sorted(counters.items()) for series in values
+        ]), use_container_width=True)
+    col_profile, col_reset = st.columns(2)
+    col_profile.checkbox("Profile the next screening run (cProfile + tracemalloc; slower)", key="profile_next_run")
+    if col_reset.button("Reset metrics"):
+        metrics.reset()
+    report = st.session_state.profile_report
+    if report:
+        st.write(f"**Last profiled run:** {report['seconds']}s, peak traced memory {report['peak_bytes'] / 2**20:.1f} MiB")
+        st.dataframe(pd.DataFrame(report["memory"]), use_container_width=True)
+        st.text(report["cpu"])
+        st.download_button("Download CPU profile", data=report["cpu"].encode("utf-8"),
+                           file_name="screening_profile.txt", mime="text/plain")